@@ -7,8 +7,14 @@ class A_NEW_Star(A_Star):
     2. Obstáculos Dinâmicos (Time-Aware): A cauda sai do caminho conforme andamos.
     """
 
-    def __init__(self, rows, cols):
-        super().__init__(rows, cols)
+    WRAP = True
+    TIME_AWARE = True
+
+    def __init__(self, rows, cols, tsp_mode="auto", max_perm_foods=3, safety=True):
+        super().__init__(rows, cols, tsp_mode, max_perm_foods, safety)
+        # limite de nós da busca temporal (célula, tempo): múltiplo dos nós que
+        # o A* estático expandiu ao falhar (a região que a cabeça alcança)
+        self.timed_factor = 4
 
     def heuristic(self, a, b):
         """Distância Manhattan com wrap-around."""
@@ -28,86 +34,36 @@ class A_NEW_Star(A_Star):
         
         return dr + dc
 
-    def get_neighbors(self, node, obstacles_info):
-        """
-        Retorna vizinhos considerando wrap e a movimentação da cauda.
-        
-        obstacles_info: Espera-se que seja um Dicionário {posicao: indice_no_corpo}
-        para a snake, ou um Set normal para outros obstáculos estáticos.
-        """
-        neighbors = []
-        directions = [(-1, 0), (1, 0), (0, -1), (0, 1)] 
-        
-        # O custo 'g' do nó atual representa quantos "frames" se passaram.
-        # No próximo passo, teremos andado (node.g + 1) vezes.
-        steps_taken = node.g + 1
-
-        # Verifica se obstacles_info é o nosso mapa especial de índices (dict)
-        # Se for set, é obstáculo estático padrão.
-        is_dynamic_snake = isinstance(obstacles_info, dict)
-        snake_len = len(obstacles_info) if is_dynamic_snake else 0
-
-        for dr, dc in directions:
-            # Posição crua
-            raw_r = node.position[0] + dr
-            raw_c = node.position[1] + dc
-
-            # Aplica wrap (mundo infinito)
-            r = raw_r % self.rows
-            c = raw_c % self.cols
-            next_pos = (r, c)
-
-            is_valid = True
-
-            # --- LÓGICA TIME-AWARE ---
-            if next_pos in obstacles_info:
-                if is_dynamic_snake:
-                    # Se está no corpo da cobra, verificamos em qual parte.
-                    # Index 0 = Cabeça, Index N = Cauda.
-                    part_index = obstacles_info[next_pos]
-                    
-                    # Quantos turnos faltam para essa parte do corpo sair daí?
-                    # Ex: Cobra tam 5. Parte índice 3 (quase na cauda). 
-                    # Ela sai em (5 - 3) = 2 turnos.
-                    turns_to_clear = snake_len - part_index
-                    
-                    # Se já andamos passos suficientes para ela sumir, NÃO é obstáculo.
-                    # Caso contrário (steps_taken < turns_to_clear), ainda é parede.
-                    if steps_taken < turns_to_clear:
-                        is_valid = False
-                else:
-                    # Obstáculo estático (Set)
-                    is_valid = False
-
-            if is_valid:
-                neighbors.append(next_pos)
-
-        return neighbors
-
-
     def find_best_path_tsp(self, start_pos, food_positions, snake_body):
-
-        snake_body_map = {pos: i for i, pos in enumerate(snake_body)}
-        return super().find_best_path_tsp(start_pos, food_positions, snake_body_map)
-
-
-    def next_direction(self, start_pos, food_positions, snake_body):
         """
-        Calcula a próxima direção baseada no caminho otimizado.
+        Time-aware: a parte de índice i do corpo deixa de ser obstáculo depois
+        de len(corpo) - i passos (free_at preparado por grid_search.set_body).
+
+        O plano estático vem primeiro: um caminho que evita o corpo inteiro
+        também vale com o tempo, é bem mais barato e deixa a snake com mais
+        folga. Só quando nenhuma food é alcançável com o corpo parado roda a
+        busca no espaço (célula, tempo) da cabeça até cada food, uma vez por
+        plano e com um limite de expansões. Se ela também falha, fica o
+        resultado do estático (None).
         """
-        if not self.current_path:
-            objectives = [pos for pos in food_positions if pos is not None]
-            path = self.find_best_path_tsp(start_pos, objectives, snake_body)
-            if path and len(path) > 1:
-                self.current_path = path[1:]
-            else:
-                return None
-
-        if not self.current_path:
-            return None
-
-        next_step = self.current_path.pop(0)
-        curr_r, curr_c = start_pos
+        path = super().find_best_path_tsp(start_pos, food_positions, snake_body)
+        if path is not None:
+            return path
+
+        search = self.grid_search
+        # a última busca estática saiu da cabeça e varreu toda a região
+        # alcançável sem achar food: o limite é um múltiplo do tamanho dela
+        budget = self.timed_factor * max(search.expansions, self.rows + self.cols)
+        best = None
+        for pos in food_positions:
+            timed_path, _ = search.search_timed(start_pos, pos, max_expansions=budget)
+            if timed_path and (best is None or len(timed_path) < len(best)):
+                best = timed_path
+        self.planned_legs.clear()
+        return best
+
+    def _direction_to(self, current, next_step):
+        curr_r, curr_c = current
         next_r, next_c = next_step
 
         # Comparações considerando o wrap (módulo) para definir a direção
@@ -120,4 +76,4 @@ class A_NEW_Star(A_Star):
         if next_c == (curr_c + 1) % self.cols:
             return "right"
 
-        return None
\ No newline at end of file
+        return None
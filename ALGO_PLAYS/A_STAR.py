@@ -1,24 +1,54 @@
-import heapq
 import itertools
+from collections import deque
 
-class Node:
-    """Classe auxiliar para o algoritmo A*"""
-    def __init__(self, position, parent=None):
-        self.position = position
-        self.parent = parent
-        self.g = 0  # Custo do início até aqui
-        self.h = 0  # Heurística (distância estimada até o fim)
-        self.f = 0  # Custo total (g + h)
-
-    def __lt__(self, other):
-        return self.f < other.f
+from ALGO_PLAYS.grid_search import GridAStar
+from ALGO_PLAYS.safety import SurvivalCheck
+from ALGO_PLAYS.tsp import held_karp_order
 
 class A_Star:
-    def __init__(self, rows, cols):
+    # grid toroidal? (A_NEW_Star liga o wrap)
+    WRAP = False
+    # o corpo sai do caminho com o tempo? (set_body, _first_blocked_step)
+    TIME_AWARE = False
+
+    def __init__(self, rows, cols, tsp_mode="auto", max_perm_foods=3, safety=True):
         self.rows = rows
         self.cols = cols
-        # cache simples para não recalcular caminho a cada passo
-        self.current_path = []
+        # ordem das foods: "permutations" (A* por par, O(k!)), "held_karp"
+        # (uma BFS por origem + DP) ou "auto" (held_karp acima de max_perm_foods)
+        self.tsp_mode = tsp_mode
+        self.max_perm_foods = max_perm_foods
+        # motor de busca com buffers pré-alocados (índices planos de célula)
+        self.grid_search = GridAStar(rows, cols, wrap=self.WRAP)
+        # cache do caminho: próximos passos até a food alvo (popleft O(1))
+        self.current_path = deque()
+        # trechos seguintes da melhor ordem do último TSP (food -> food),
+        # reaproveitados/reparados quando a food alvo é comida
+        self.planned_legs = deque()
+        # estado usado para validar o cache a cada tick
+        self._expected_head = None
+        self._plan_foods = frozenset()
+
+        # contadores do replanejamento
+        self.replans = 0      # find_best_path_tsp completos
+        self.repairs = 0      # trechos reaproveitados/reparados
+        self.cache_hits = 0   # ticks servidos direto do cache
+
+        # checagem de sobrevivência (cauda alcançável depois de comer)
+        self.safety = SurvivalCheck(rows, cols, wrap=self.WRAP) if safety else None
+        self.fallbacks = 0    # ticks resolvidos por _survival_step
+        # depois de um plano inseguro, só sobrevive por alguns ticks antes de
+        # tentar o TSP de novo (o corpo precisa andar para o plano mudar)
+        self.fallback_hold = 4
+        self._hold = 0
+
+    def reset(self):
+        """Esquece o plano do episódio anterior (os contadores continuam somando)."""
+        self.current_path.clear()
+        self.planned_legs.clear()
+        self._expected_head = None
+        self._plan_foods = frozenset()
+        self._hold = 0
 
     def _in_bounds(self, pos):
         r, c = pos
@@ -28,63 +58,20 @@ class A_Star:
         """Calcula a distância Manhattan (grid)"""
         return abs(a[0] - b[0]) + abs(a[1] - b[1])
 
-    def get_neighbors(self, node, obstacles):
-        """Retorna vizinhos válidos (não são obstáculos e estão dentro do grid)"""
-        neighbors = []
-        directions = [(-1, 0), (1, 0), (0, -1), (0, 1)] 
-
-        for dr, dc in directions:
-            r, c = node.position[0] + dr, node.position[1] + dc
-
-            if self._in_bounds((r, c)) and (r, c) not in obstacles:
-                neighbors.append((r, c))
-        return neighbors
-
     def a_star_search(self, start, end, obstacles):
         """
         Executa o A* entre start e end.
         Retorna: (caminho_lista, custo) ou (None, infinity) se falhar.
         """
-        open_list = []
-        closed_set = set()
-
-        start_node = Node(start)
-        end_node = Node(end)
-        
-        heapq.heappush(open_list, start_node)
-
-        while open_list:
-            current_node = heapq.heappop(open_list)
-            closed_set.add(current_node.position)
-
-            if current_node.position == end:
-                path = []
-                current = current_node
-                while current:
-                    path.append(current.position)
-                    current = current.parent
-                return path[::-1], len(path)
-
-            neighbors = self.get_neighbors(current_node, obstacles)
-            
-            for next_pos in neighbors:
-                if next_pos in closed_set:
-                    continue
-
-                neighbor = Node(next_pos, current_node)
-                neighbor.g = current_node.g + 1
-                neighbor.h = self.heuristic(neighbor.position, end_node.position)
-                neighbor.f = neighbor.g + neighbor.h
-
-                heapq.heappush(open_list, neighbor)
-
-        return None, float('inf')
+        self.grid_search.set_obstacles(obstacles)
+        return self.grid_search.search(start, end)
 
     def find_best_path_tsp(self, start_pos, food_positions, snake_body):
         """
         Resolve o TSP sobre as foods e devolve o caminho da cabeça até a 1ª food
         da melhor ordem.
         """
+        self.planned_legs = deque()
         if not food_positions:
             return []
 
@@ -92,16 +79,24 @@ class A_Star:
         if start_pos in obstacles:
             obstacles.remove(start_pos)
 
+        # obstáculos carregados uma vez para todas as buscas deste plano
+        self.grid_search.set_obstacles(obstacles)
+        if self.TIME_AWARE:
+            self.grid_search.set_body(snake_body)
+
+        if self._use_held_karp(len(food_positions)):
+            return self._best_path_held_karp(start_pos, food_positions)
+
         perms = list(itertools.permutations(food_positions))
         
         best_cost = float('inf')
-        best_first_path = None
+        best_legs = None
         distance_cache = {} 
 
         def get_path_cost(p1, p2):
             key = (p1, p2)
             if key not in distance_cache:
-                path, cost = self.a_star_search(p1, p2, obstacles)
+                path, cost = self.grid_search.search(p1, p2)
                 distance_cache[key] = (path, cost)
             return distance_cache[key]
 
@@ -109,7 +104,7 @@ class A_Star:
             current_cost = 0
             current_pos = start_pos
             possible = True
-            first_segment_path = None
+            legs = []
 
             for i, target in enumerate(perm):
                 path, cost = get_path_cost(current_pos, target)
@@ -117,41 +112,131 @@ class A_Star:
                     possible = False
                     break
 
-                if i == 0:
-                    first_segment_path = path
-
+                legs.append(path)
                 current_cost += cost
                 current_pos = target
 
             if possible and current_cost < best_cost:
                 best_cost = current_cost
-                best_first_path = first_segment_path
+                best_legs = legs
+
+        if best_legs is None:
+            # nenhuma ordem visita todas: vai na food mais próxima alcançável
+            # (todo primeiro trecho já está no cache)
+            first_legs = [get_path_cost(start_pos, pos) for pos in food_positions]
+            reachable = [path for path, _ in first_legs if path is not None]
+            return min(reachable, key=len) if reachable else None
+        self.planned_legs = deque(best_legs[1:])
+        return best_legs[0]
+
+    def _use_held_karp(self, n_foods):
+        if self.tsp_mode == "held_karp":
+            return True
+        if self.tsp_mode == "permutations":
+            return False
+        return n_foods > self.max_perm_foods
+
+    def _best_path_held_karp(self, start_pos, food_positions):
+        """
+        Mesma ideia do TSP por permutações, mas com uma BFS por origem
+        (cabeça + cada food) e Held-Karp sobre a matriz de distâncias.
+        Foods inalcançáveis a partir da cabeça ficam de fora da ordem.
+        Espera os obstáculos já carregados em self.grid_search.
+        """
+        search = self.grid_search
+        cols = self.cols
+
+        head_dist, head_parent = search.distance_field(start_pos)
+        targets = [
+            pos for pos in food_positions
+            if head_dist[pos[0] * cols + pos[1]] >= 0
+        ]
+        if not targets:
+            return None
 
-        return best_first_path
+        sources = [start_pos] + targets
+        food_fields = [search.distance_field(pos) for pos in targets]
+        fields = [head_dist] + [dist for dist, _ in food_fields]
+        cells = [r * cols + c for r, c in sources]
+
+        dist = []
+        for field in fields:
+            row = []
+            for cell in cells:
+                d = field[cell]
+                row.append(d if d >= 0 else float('inf'))
+            dist.append(row)
+
+        cost, order = held_karp_order(dist)
+        if not order:
+            # nenhuma ordem visita todas: vai na food mais próxima
+            first = min(targets, key=lambda pos: head_dist[pos[0] * cols + pos[1]])
+            return search.path_from_field(head_parent, first)
+
+        self.planned_legs = deque(
+            search.path_from_field(food_fields[a - 1][1], targets[b - 1])
+            for a, b in zip(order, order[1:])
+        )
+        return search.path_from_field(head_parent, targets[order[0] - 1])
 
     # ------------------------ NOVO: interface para o Game ------------------------
 
     def next_direction(self, start_pos, food_positions, snake_body):
         """
         Decide a próxima direção ('up','down','left','right') a partir do estado atual.
-        Reaproveita/mantém um caminho interno em self.current_path.
+        Reaproveita/mantém um caminho interno em self.current_path:
+          1. valida o cache contra o que mudou (cabeça, foods realocadas)
+          2. comida a food alvo, reaproveita/repara o próximo trecho do plano
+          3. só então roda o find_best_path_tsp completo
+          4. se o caminho não passa na checagem de sobrevivência (safety),
+             segue _survival_step em vez dele
         """
-        # 1. Se não temos caminho, calcula um novo
+        objectives = [pos for pos in food_positions if pos is not None]
+
+        if self.current_path:
+            if self._cached_path_is_valid(start_pos, objectives, snake_body):
+                self.cache_hits += 1
+            else:
+                self.current_path.clear()
+                self.planned_legs.clear()
+
+        if not self.current_path and self._hold > 0:
+            self._hold -= 1
+            step = self._survival_step(start_pos, snake_body)
+            if step is not None:
+                self.fallbacks += 1
+                return self._direction_to(start_pos, step)
+
         if not self.current_path:
-            objectives = [pos for pos in food_positions if pos is not None]
-            path = self.find_best_path_tsp(start_pos, objectives, snake_body)
+            path = self._reuse_planned_leg(start_pos, objectives, snake_body)
+            if path is None:
+                self.replans += 1
+                path = self.find_best_path_tsp(start_pos, objectives, snake_body)
+            if self.safety is not None and not (
+                path and len(path) > 1 and self.safety.path_is_safe(path, snake_body, objectives)
+            ):
+                # comer por esse caminho prende a snake (ou não há caminho):
+                # passos de sobrevivência por fallback_hold ticks, depois replaneja
+                self.planned_legs.clear()
+                step = self._survival_step(start_pos, snake_body)
+                if step is None:
+                    return None
+                self.fallbacks += 1
+                self._hold = self.fallback_hold
+                return self._direction_to(start_pos, step)
             if path and len(path) > 1:
                 # ignorar a posição atual (start_pos) no caminho
-                self.current_path = path[1:]
+                self.current_path = deque(path[1:])
+                self._plan_foods = frozenset(objectives)
             else:
                 return None  # sem caminho
 
-        # 2. Se ainda temos passos no caminho, pega o próximo
-        if not self.current_path:
-            return None
+        next_step = self.current_path.popleft()
+        self._expected_head = next_step
+        return self._direction_to(start_pos, next_step)
 
-        next_step = self.current_path.pop(0)
-        curr_r, curr_c = start_pos
+    def _direction_to(self, current, next_step):
+        curr_r, curr_c = current
         next_r, next_c = next_step
 
         # sem wrap aqui – A_NEW_Star sobrescreve se precisar
@@ -164,4 +249,133 @@ class A_Star:
         if next_c == curr_c + 1:
             return "right"
 
-        return None
\ No newline at end of file
+        return None
+
+    # ------------------------ replanejamento incremental ------------------------
+
+    def _cached_path_is_valid(self, start_pos, objectives, snake_body):
+        """
+        O(1) no caso comum: a cabeça está onde mandamos e as foods não mudaram
+        (só a cabeça entrou no caminho e a cauda liberou células). Se alguma
+        food foi realocada, revalida os passos restantes e desiste do cache
+        quando a nova food está mais perto que o alvo atual.
+        """
+        if start_pos != self._expected_head:
+            return False
+
+        foods = frozenset(objectives)
+        if foods == self._plan_foods:
+            return True
+
+        target = self.current_path[-1]
+        if target not in foods:
+            return False
+        if self._first_blocked_step(self.current_path, snake_body) is not None:
+            return False
+        remaining = len(self.current_path)
+        for pos in foods - self._plan_foods:
+            if self.heuristic(start_pos, pos) < remaining:
+                return False
+
+        self._plan_foods = foods
+        return True
+
+    def _first_blocked_step(self, steps, snake_body):
+        """
+        Índice do primeiro passo de 'steps' (células a partir do próximo tick)
+        ocupado pelo corpo na hora em que chegaríamos lá, ou None.
+        """
+        length = len(snake_body)
+        # índice da parte na célula em O(1) pelos ticks de entrada da snake
+        # (lista comum: index, como antes)
+        age_of = getattr(snake_body, "age_of", snake_body.index)
+        for i, cell in enumerate(steps):
+            if cell not in snake_body:
+                continue
+            if not self.TIME_AWARE:
+                return i
+            # a parte de índice k sai em length - k passos
+            if i + 1 < length - age_of(cell):
+                return i
+        return None
+
+    def _reuse_planned_leg(self, start_pos, objectives, snake_body):
+        """
+        Depois de comer, o próximo trecho do último plano já começa na cabeça.
+        Se ele segue livre, é usado direto; se o corpo novo o cortou, mantém o
+        prefixo livre e roda um A* novo do último passo válido até o alvo (uma
+        busca em vez do TSP inteiro). Nada da busca anterior é reaproveitado
+        além do próprio trecho: não é um LPA*/D* Lite, só revalidação +
+        replanejamento do pedaço cortado. Retorna None quando o TSP completo é
+        necessário.
+        """
+        if not self.planned_legs:
+            return None
+
+        leg = self.planned_legs.popleft()
+        target = leg[-1]
+        if leg[0] != start_pos or target not in objectives:
+            self.planned_legs.clear()
+            return None
+
+        # a nova food (realocada) mais perto que o alvo: vale replanejar
+        for pos in objectives:
+            if pos not in self._plan_foods and self.heuristic(start_pos, pos) < len(leg) - 1:
+                self.planned_legs.clear()
+                return None
+
+        blocked = self._first_blocked_step(leg[1:], snake_body)
+        if blocked is None:
+            self.repairs += 1
+            return leg
+
+        # mantém o prefixo válido e busca do último passo bom até o alvo;
+        # o prefixo vira corpo enquanto andamos, então é obstáculo na busca
+        prefix = leg[:blocked + 1]
+        obstacles = set(snake_body)
+        obstacles.update(prefix[:-1])
+        obstacles.discard(prefix[-1])
+        path, _ = self.a_star_search(prefix[-1], target, obstacles)
+        if path is None:
+            self.planned_legs.clear()
+            return None
+
+        self.repairs += 1
+        return prefix[:-1] + path
+
+    # ------------------------ sobrevivência ------------------------
+
+    def _survival_step(self, start_pos, snake_body):
+        """
+        Próximo passo quando não há caminho seguro até uma food:
+          1. perseguir a cauda (o espaço que ela libera nunca acaba)
+          2. senão, o vizinho livre com a maior região alcançável
+        """
+        body = list(snake_body)
+        tail = body[-1]
+        # cauda duplicada (acabou de comer): ela não sai no próximo tick
+        tail_stays = len(body) > 1 and body[-2] == tail
+
+        path, _ = self.a_star_search(start_pos, tail, body[1:-1])
+        if path and len(path) > 1 and not (tail_stays and len(path) == 2):
+            step = path[1]
+            if self.safety.tail_reachable([step] + body[:-1]):
+                return step
+
+        best, best_key = None, None
+        cols = self.cols
+        head = start_pos[0] * cols + start_pos[1]
+        neighbors = self.grid_search.neighbors
+        for k in range(4):
+            nb = neighbors[4 * head + k]
+            if nb < 0:
+                continue
+            cell = divmod(nb, cols)
+            if cell in snake_body and (cell != tail or tail_stays):
+                continue
+            moved = [cell] + body[:-1]
+            key = (self.safety.tail_reachable(moved), self.safety.region_size(moved))
+            if best_key is None or key > best_key:
+                best, best_key = cell, key
+        return best
+
@@ -0,0 +1,124 @@
+from array import array
+
+from ALGO_PLAYS.grid_search import GridAStar
+
+
+class Hamiltonian:
+    """
+    Segue um ciclo hamiltoniano do grid (visita todas as células e volta ao
+    início), então a snake nunca se prende e pode encher o tabuleiro.
+
+    O ciclo é calculado uma vez e guardado como arrays: cycle[k] = célula na
+    posição k e order[célula] = k. Enquanto o corpo ocupa no máximo
+    shortcut_limit do tabuleiro, vale pular trechos do ciclo em direção à
+    food: o corpo está sempre no trecho [cauda, cabeça] do ciclo, então um
+    vizinho que cai antes da cauda (com folga para o crescimento) é seguro.
+    Cada tick olha só os 4 vizinhos e as foods: O(1).
+    """
+
+    def __init__(self, rows, cols, shortcut_limit=0.5, safety_margin=4):
+        self.rows = rows
+        self.cols = cols
+        self.n_cells = rows * cols
+        self.shortcut_limit = shortcut_limit
+        # células de folga entre a nova cabeça e a cauda (crescimento pendente)
+        self.safety_margin = safety_margin
+
+        self.cycle = self.build_cycle(rows, cols)
+        self.order = array("l", [0]) * self.n_cells
+        for position, cell in enumerate(self.cycle):
+            self.order[cell] = position
+
+        # vizinhos com wrap (o jogo é toroidal), na ordem up, down, left, right
+        self.neighbors = GridAStar(rows, cols, wrap=True).neighbors
+        self._oriented = False
+
+        # contadores
+        self.shortcuts = 0   # ticks que pularam parte do ciclo
+
+    @staticmethod
+    def build_cycle(rows, cols):
+        """
+        Ciclo em zigue-zague (boustrophedon): percorre as linhas sem a coluna 0
+        e volta pela coluna 0 (ou o transposto, com colunas). Com linhas e
+        colunas ímpares o zigue-zague termina na coluna cols - 1 da última
+        linha; como o grid é toroidal, ela é vizinha (wrap) da coluna 0, e o
+        ciclo volta por ela do mesmo jeito.
+        """
+        if rows < 2 or cols < 2:
+            raise ValueError("o ciclo hamiltoniano precisa de um grid de pelo menos 2x2")
+
+        cells = array("l")
+        if rows % 2 == 1 and cols % 2 == 0:
+            for c in range(cols):
+                span = range(1, rows) if c % 2 == 0 else range(rows - 1, 0, -1)
+                cells.extend(r * cols + c for r in span)
+            cells.extend(c for c in range(cols - 1, -1, -1))
+        else:
+            # linhas pares: a última linha termina na coluna 1, vizinha da 0;
+            # linhas ímpares: termina na coluna cols - 1, vizinha da 0 pelo wrap
+            for r in range(rows):
+                span = range(1, cols) if r % 2 == 0 else range(cols - 1, 0, -1)
+                cells.extend(r * cols + c for c in span)
+            cells.extend(r * cols for r in range(rows - 1, -1, -1))
+        return cells
+
+    def reset(self):
+        """Novo jogo: o sentido do ciclo é conferido de novo no primeiro tick."""
+        self._oriented = False
+
+    def _orient(self, head, neck):
+        """Inverte o sentido do ciclo se a snake inicial está andando contra ele."""
+        n = self.n_cells
+        if (self.order[neck] - self.order[head]) % n == 1:
+            self.cycle.reverse()
+            for position, cell in enumerate(self.cycle):
+                self.order[cell] = position
+        self._oriented = True
+
+    # ------------------------ interface para o Game ------------------------
+
+    def next_direction(self, start_pos, food_positions, snake_body):
+        cols, n = self.cols, self.n_cells
+        order, neighbors = self.order, self.neighbors
+        head = start_pos[0] * cols + start_pos[1]
+
+        if not self._oriented and len(snake_body) > 1:
+            neck = snake_body[1]
+            self._orient(head, neck[0] * cols + neck[1])
+
+        h = order[head]
+        best = self.cycle[(h + 1) % n]
+        best_d = 1
+
+        length = len(snake_body)
+        if length < self.shortcut_limit * n:
+            tail_r, tail_c = snake_body[-1]
+            # células livres à frente da cabeça, até a cauda
+            tail_d = (order[tail_r * cols + tail_c] - h) % n
+            # food mais próxima seguindo o ciclo: não passar dela
+            target_d = n
+            for pos in food_positions:
+                if pos is not None:
+                    d = (order[pos[0] * cols + pos[1]] - h) % n
+                    if 0 < d < target_d:
+                        target_d = d
+
+            limit = min(target_d, tail_d - self.safety_margin - 1)
+            base = 4 * head
+            for k in range(4):
+                nb = neighbors[base + k]
+                d = (order[nb] - h) % n
+                if best_d < d <= limit and divmod(nb, cols) not in snake_body:
+                    best, best_d = nb, d
+            if best_d > 1:
+                self.shortcuts += 1
+
+        return self._direction_to(head, best)
+
+    def _direction_to(self, head, cell):
+        base = 4 * head
+        for k, direction in enumerate(("up", "down", "left", "right")):
+            if self.neighbors[base + k] == cell:
+                return direction
+        return None
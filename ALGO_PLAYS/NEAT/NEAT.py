@@ -1,8 +1,154 @@
 import os
-import pickle
-import neat
+import multiprocessing
+from functools import lru_cache, partial
 
+import numpy as np
+
+from batch_env import BatchSnakeEnv, ALIVE, LOSS
+from engine import SnakeEngine
+from ALGO_PLAYS.NEAT.compiled_net import CompiledNetwork
 from ALGO_PLAYS.game_info import game_info
+from ALGO_PLAYS.NEAT.observations import make_encoder
+from ALGO_PLAYS.NEAT.storage import (
+    BestGenomeStore,
+    CompiledNetCache,
+    PopulationCheckpointer,
+    atomic_pickle,
+    load_pickle,
+)
+
+# ordem das 4 saídas da rede
+OUTPUT_DIRECTIONS = ("up", "down", "left", "right")
+
+
+# --------------------------------------------------------------------------
+#  CODIFICAÇÃO DAS ENTRADAS E SIMULAÇÃO HEADLESS (USADAS NOS WORKERS)
+# --------------------------------------------------------------------------
+
+def decode_outputs(outputs):
+    """Argmax das 4 saídas [up, down, left, right] -> direção (ou None)."""
+    if len(outputs) != 4:
+        return None
+    idx = max(range(4), key=lambda i: outputs[i])
+    return OUTPUT_DIRECTIONS[idx]
+
+
+@lru_cache(maxsize=None)
+def _encoder(name, rows, cols):
+    """Um encoder por (nome, tabuleiro) em cada processo (as tabelas dos raios são reaproveitadas)."""
+    return make_encoder(name, rows, cols)
+
+
+def play_episode(net, rows, cols, seed, max_steps, n_foods=3, encoder="basic"):
+    """
+    Joga um episódio headless com a rede (entradas do encoder de nome
+    'encoder'). Termina ao morrer, vencer, atingir max_steps ou ficar
+    rows*cols passos sem comer (snake andando em círculos).
+    Retorna (score, steps, condição) com condição "win", "loss",
+    "starved" ou "timeout".
+    """
+    encode = _encoder(encoder, rows, cols).encode
+    engine = SnakeEngine(rows, cols, n_foods=n_foods, seed=seed)
+    hunger_limit = rows * cols
+    last_meal = 0
+
+    while not engine.done:
+        if engine.steps >= max_steps:
+            return engine.score, engine.steps, "timeout"
+        if engine.steps - last_meal >= hunger_limit:
+            return engine.score, engine.steps, "starved"
+
+        direction = decode_outputs(net.activate(encode(engine)))
+        engine.step(direction)
+        if engine.last_eaten is not None:
+            last_meal = engine.steps
+
+    return engine.score, engine.steps, engine.condition
+
+
+def play_episodes_batched(net, rows, cols, episodes, seed, max_steps, n_foods=3, encoder="basic"):
+    """
+    Joga 'episodes' jogos em lockstep (BatchSnakeEnv) com uma rede compilada:
+    um forward por tick para todos os jogos. Mesmas regras de término de
+    play_episode. Retorna uma lista de (score, steps, condição).
+    """
+    encoder = _encoder(encoder, rows, cols)
+    env = BatchSnakeEnv(episodes, rows, cols, n_foods=n_foods, seed=seed)
+    obs = np.empty((episodes, encoder.num_inputs))
+    hunger_limit = rows * cols
+    last_meal = np.zeros(episodes, dtype=np.int64)
+    outcome = [None] * episodes
+
+    while True:
+        alive = env.condition == ALIVE
+        timeout = alive & (env.steps >= max_steps)
+        starved = alive & ~timeout & (env.steps - last_meal >= hunger_limit)
+        for i in np.flatnonzero(timeout):
+            outcome[i] = "timeout"
+        for i in np.flatnonzero(starved):
+            outcome[i] = "starved"
+        env.truncate(timeout | starved)
+        if not (env.condition == ALIVE).any():
+            break
+
+        actions = net.activate_batch(encoder.encode_batch(env, obs)).argmax(axis=1)
+        ate, _ = env.step(actions)
+        last_meal[ate] = env.steps[ate]
+
+    results = []
+    for i in range(episodes):
+        condition = outcome[i]
+        if condition is None:
+            condition = "loss" if env.condition[i] == LOSS else "win"
+        results.append((int(env.score[i]), int(env.steps[i]), condition))
+    return results
+
+
+def episode_fitness(score, steps, condition):
+    """+10 por comida, +0.01 por passo vivo, -5 ao morrer ou passar fome."""
+    fitness = 10.0 * score + 0.01 * steps
+    if condition in ("loss", "starved"):
+        fitness -= 5.0
+    return fitness
+
+
+def eval_genome(genome, config, rows, cols, episodes=3, max_steps=2000, seed=0,
+                n_foods=3, batched=False, encoder="basic"):
+    """
+    Fitness de um genome: média de 'episodes' jogos com sementes seed,
+    seed + 1, ... (as mesmas para todos os genomes, comparação justa).
+    batched=True joga os episódios em lockstep com a rede compilada.
+    encoder é o nome do encoder das entradas (ver observations.ENCODERS).
+    Função de módulo para poder ser enviada aos processos do pool.
+    """
+    if batched:
+        net = CompiledNetwork.create(genome, config)
+        results = play_episodes_batched(net, rows, cols, episodes, seed, max_steps, n_foods, encoder)
+        return sum(episode_fitness(*result) for result in results) / episodes
+
+    import neat
+
+    net = neat.nn.FeedForwardNetwork.create(genome, config)
+    total = 0.0
+    for episode in range(episodes):
+        score, steps, condition = play_episode(
+            net, rows, cols, seed + episode, max_steps, n_foods, encoder
+        )
+        total += episode_fitness(score, steps, condition)
+    return total / episodes
+
+
+def load_config(config_path):
+    """neat.Config com os tipos padrão do neat-python (os do config.txt)."""
+    import neat
+
+    return neat.Config(
+        neat.DefaultGenome,
+        neat.DefaultReproduction,
+        neat.DefaultSpeciesSet,
+        neat.DefaultStagnation,
+        config_path,
+    )
 
 
 class NEAT_AI:
@@ -10,76 +156,130 @@ class NEAT_AI:
     Controla a evolução NEAT e controla a snake em tempo de execução.
     """
 
-    def __init__(self, rows, cols, config_path):
+    def __init__(self, rows, cols, config_path, episodes_per_genome=3,
+                 max_steps=2000, seed=0, num_workers=None, n_foods=3,
+                 batched_eval=False, encoder="basic"):
         self.rows = rows
         self.cols = cols
         self.config_path = config_path
-        self.config = neat.Config(
-            neat.DefaultGenome,
-            neat.DefaultReproduction,
-            neat.DefaultSpeciesSet,
-            neat.DefaultStagnation,
-            config_path,
-        )
+
+        # parâmetros da avaliação headless
+        self.episodes_per_genome = episodes_per_genome
+        self.max_steps = max_steps
+        self.seed = seed
+        self.n_foods = n_foods
+        # processos do pool (None = todos os núcleos, 1 = serial)
+        self.num_workers = num_workers
+        # episódios de cada genome em lockstep com a rede compilada (NumPy)
+        self.batched_eval = batched_eval
+        self.config = load_config(config_path)
+
+        # entradas da rede (ver observations.py); o config precisa do mesmo num_inputs
+        self.encoder = make_encoder(encoder, rows, cols)
+        if self.config.genome_config.num_inputs != self.encoder.num_inputs:
+            raise ValueError(
+                f"{config_path} tem num_inputs = {self.config.genome_config.num_inputs}, "
+                f"o encoder '{encoder}' usa {self.encoder.num_inputs} "
+                f"(gere um config com observations.write_config)"
+            )
 
         self.population = None
         self.best_genome = None
         self.net = None  # rede do melhor genome para jogar
+        # entradas de choose_action, reaproveitadas a cada tick
+        self._inputs = np.zeros(self.encoder.num_inputs)
 
         # caminhos para salvar/ler melhor indivíduo
         self.checkpoint_dir = os.path.join(os.path.dirname(config_path), "checkpoints")
         os.makedirs(self.checkpoint_dir, exist_ok=True)
         self.best_path = os.path.join(os.path.dirname(config_path), "current_best.pickle")
+        # melhor genome de cada geração (checkpoints/best/index.json)
+        self.store = BestGenomeStore(os.path.join(self.checkpoint_dir, "best"))
+        # rede compilada do current_best.pickle (current_best.net.pickle)
+        self.net_cache = CompiledNetCache(self.best_path, config_path)
 
-        # se já existe um melhor genome salvo, carrega
-        if os.path.isfile(self.best_path):
-            with open(self.best_path, "rb") as f:
-                self.best_genome = pickle.load(f)
-                self.net = neat.nn.FeedForwardNetwork.create(self.best_genome, self.config)
+        # se já existe um melhor genome salvo, carrega (vazio ou corrompido = nenhum)
+        self.ensure_net_loaded()
 
     # ----------------------------------------------------------------------
     #  TREINO (RODADO EM SCRIPT SEPARADO, NÃO NO LOOP DO JOGO INTERATIVO)
     # ----------------------------------------------------------------------
 
+    def _genome_evaluator(self):
+        """eval_genome com os parâmetros deste NEAT_AI já aplicados."""
+        return partial(
+            eval_genome,
+            rows=self.rows,
+            cols=self.cols,
+            episodes=self.episodes_per_genome,
+            max_steps=self.max_steps,
+            seed=self.seed,
+            n_foods=self.n_foods,
+            batched=self.batched_eval,
+            encoder=self.encoder.name,
+        )
+
     def _evaluate_genomes(self, genomes, config):
         """
         Função de fitness: usada pelo NEAT para treinar.
-        Aqui você simula jogos automaticamente (sem render) para cada genome.
-        Para manter simples, deixo uma “casca” para você expandir depois.
+        Simula jogos headless (SnakeEngine) para cada genome, em série.
         """
+        evaluate = self._genome_evaluator()
         for genome_id, genome in genomes:
-            genome.fitness = 0.0
-
-            # Aqui você teria um loop de simulação (sem pygame) usando
-            # as mesmas regras do seu Game, mas sem desenhar.
-            #
-            # Durante a simulação:
-            #   - colidir com o próprio corpo -> genome.fitness -= X
-            #   - comer comida -> genome.fitness += Y
-            #
-            # Deixo apenas um esqueleto para não explodir o código:
+            genome.fitness = evaluate(genome, config)
 
-            # Exemplo mínimo (substitua por simulação real):
-            genome.fitness -= 1.0  # penalização pequena só para não ficar 0
-
-    def train(self, n_generations=50):
+    def train(self, n_generations=50, resume=True, checkpoint_interval=1):
         """
         Treina uma população NEAT, salva o melhor indivíduo em current_best.pickle.
         Essa função deve ser rodada em um script separado (não no loop pygame).
+
+        A população é salva em checkpoints/ a cada checkpoint_interval
+        gerações; com resume=True o treino continua do checkpoint mais
+        recente e n_generations conta desde a geração 0 (um treino morto na
+        geração 30 de 50 roda só as 20 que faltam). Começando do zero, os
+        checkpoints e os melhores genomes de treinos anteriores são apagados.
         """
-        self.population = neat.Population(self.config)
+        import neat
+
+        checkpointer = PopulationCheckpointer(self.checkpoint_dir, checkpoint_interval)
+        latest = checkpointer.latest() if resume else None
+        if latest is not None:
+            self.population = checkpointer.restore(latest, self.config)
+        else:
+            # outro treino (talvez outro tabuleiro/config): nem retomar dele
+            # nem comparar o vencedor com os genomes dele
+            checkpointer.clear()
+            self.store.clear()
+            self.population = neat.Population(self.config)
         self.population.add_reporter(neat.StdOutReporter(True))
         stats = neat.StatisticsReporter()
         self.population.add_reporter(stats)
+        self.population.add_reporter(checkpointer)
+        self.population.add_reporter(self.store)
 
-        winner = self.population.run(self._evaluate_genomes, n_generations)
+        remaining = n_generations - self.population.generation
+        winner = None
+        if remaining > 0:
+            num_workers = self.num_workers or multiprocessing.cpu_count()
+            if num_workers > 1:
+                # um processo por núcleo avaliando genomes em paralelo
+                evaluator = neat.ParallelEvaluator(num_workers, self._genome_evaluator())
+                winner = self.population.run(evaluator.evaluate, remaining)
+            else:
+                winner = self.population.run(self._evaluate_genomes, remaining)
 
-        # salva melhor genome
-        with open(self.best_path, "wb") as f:
-            pickle.dump(winner, f)
+        # o store tem também as gerações de antes do checkpoint retomado
+        stored = self.store.load()
+        if stored is not None and (winner is None or stored.fitness > winner.fitness):
+            winner = stored
+        if winner is None:
+            return None
 
+        # salva melhor genome
+        atomic_pickle(winner, self.best_path)
         self.best_genome = winner
-        self.net = neat.nn.FeedForwardNetwork.create(winner, self.config)
+        self.net = self._compile(winner)
+        return winner
 
     # ----------------------------------------------------------------------
     #  USO EM TEMPO DE JOGO (NO LOOP PYGAME)
@@ -87,26 +287,39 @@ class NEAT_AI:
 
     def ensure_net_loaded(self):
         """
-        Garante que self.net está carregada (carrega current_best.pickle se preciso).
+        Garante que self.net está carregada: do cache da rede compilada se ele
+        corresponde ao current_best.pickle, senão compilando o genome.
         """
         if self.net is not None:
             return
 
-        if os.path.isfile(self.best_path):
-            with open(self.best_path, "rb") as f:
-                self.best_genome = pickle.load(f)
-                self.net = neat.nn.FeedForwardNetwork.create(self.best_genome, self.config)
+        self.net = self.net_cache.load()
+        if self.net is not None:
+            return
+
+        self.best_genome = load_pickle(self.best_path)
+        if self.best_genome is not None:
+            self.net = self._compile(self.best_genome)
+
+    def _compile(self, genome):
+        """Rede NumPy do genome (FeedForwardNetwork se ela não suporta o genome), salva no cache."""
+        try:
+            net = CompiledNetwork.create(genome, self.config)
+        except ValueError:
+            import neat
+            return neat.nn.FeedForwardNetwork.create(genome, self.config)
+        self.net_cache.save(net)
+        return net
 
     def choose_action(self, info: game_info):
         """
         Usa a rede NEAT treinada para escolher a direção.
-        Inputs:
-          - posição normalizada da cabeça
-          - posição normalizada da primeira comida (se existir)
-          - orientação atual (one-hot)
-          - tamanho atual da snake (normalizado)
+        Inputs: os do encoder (ver observations.py).
         Output:
           - 4 saídas (up, down, left, right) -> pega o argmax.
+
+        Com a CompiledNetwork as entradas vão para um buffer fixo e o forward
+        reaproveita os buffers de valores e de saídas da rede.
         """
         self.ensure_net_loaded()
         if self.net is None:
@@ -115,53 +328,33 @@ class NEAT_AI:
         if not info.snake_positions:
             return None
 
-        head_r, head_c = info.snake_positions[0]
-
-        # normaliza posições em [0, 1]
-        head_r_n = head_r / max(1, info.rows - 1)
-        head_c_n = head_c / max(1, info.cols - 1)
+        if isinstance(self.net, CompiledNetwork):
+            outputs = self.net.activate_one(self.encoder.encode_info(info, self._inputs))
+            return OUTPUT_DIRECTIONS[int(outputs.argmax())]
 
-        # primeira food (se tiver)
-        if info.food_positions:
-            f_r, f_c = info.food_positions[0]
-            food_r_n = f_r / max(1, info.rows - 1)
-            food_c_n = f_c / max(1, info.cols - 1)
-        else:
-            food_r_n = 0.0
-            food_c_n = 0.0
-
-        # orientação one-hot
-        ori_up = 1.0 if info.orientation == "up" else 0.0
-        ori_down = 1.0 if info.orientation == "down" else 0.0
-        ori_left = 1.0 if info.orientation == "left" else 0.0
-        ori_right = 1.0 if info.orientation == "right" else 0.0
-
-        # tamanho da snake
-        size_n = len(info.snake_positions) / float(info.rows * info.cols)
-
-        inputs = [
-            head_r_n,
-            head_c_n,
-            food_r_n,
-            food_c_n,
-            ori_up,
-            ori_down,
-            ori_left,
-            ori_right,
-            size_n,
-        ]
-
-        outputs = self.net.activate(inputs)
+        outputs = self.net.activate(self.encoder.encode_info(info))
         # esperamos 4 saídas: [up, down, left, right]
-        if len(outputs) != 4:
-            return None
+        return decode_outputs(outputs)
 
-        idx = max(range(4), key=lambda i: outputs[i])
-        if idx == 0:
-            return "up"
-        elif idx == 1:
-            return "down"
-        elif idx == 2:
-            return "left"
-        else:
-            return "right"
\ No newline at end of file
+
+if __name__ == "__main__":
+    # treino headless: python -m ALGO_PLAYS.NEAT.NEAT [geracoes] [encoder]
+    import sys
+
+    from ALGO_PLAYS.NEAT.observations import write_config
+
+    generations = int(sys.argv[1]) if len(sys.argv) > 1 else 50
+    encoder_name = sys.argv[2] if len(sys.argv) > 2 else "basic"
+    base_dir = os.path.dirname(os.path.abspath(__file__))
+    config_file = os.path.join(base_dir, "config.txt")
+    if encoder_name != "basic":
+        # cada encoder tem seu diretório: config com o num_inputs certo,
+        # checkpoints e melhor genome separados dos da rede de 9 entradas
+        encoder_dir = os.path.join(base_dir, encoder_name)
+        os.makedirs(encoder_dir, exist_ok=True)
+        config_file = write_config(
+            config_file,
+            os.path.join(encoder_dir, "config.txt"),
+            make_encoder(encoder_name, 30, 40),
+        )
+    NEAT_AI(30, 40, config_file, encoder=encoder_name).train(generations)
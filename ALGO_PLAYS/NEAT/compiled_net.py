@@ -0,0 +1,170 @@
+import numpy as np
+
+
+# versões NumPy das ativações do neat-python (mesmos clamps e escalas)
+def _sigmoid(z):
+    z = np.clip(5.0 * z, -60.0, 60.0)
+    return 1.0 / (1.0 + np.exp(-z))
+
+
+def _tanh(z):
+    # o clamp em ±60 do neat não muda o resultado: tanh já é ±1.0 exato a
+    # partir de ~19 em float64 (e np.clip custa mais que o tanh em vetores pequenos)
+    return np.tanh(2.5 * z)
+
+
+def _relu(z):
+    return np.maximum(z, 0.0)
+
+
+def _identity(z):
+    return z
+
+
+def _clamped(z):
+    return np.clip(z, -1.0, 1.0)
+
+
+ACTIVATIONS = {
+    "sigmoid": _sigmoid,
+    "tanh": _tanh,
+    "relu": _relu,
+    "identity": _identity,
+    "clamped": _clamped,
+}
+
+
+class CompiledNetwork:
+    """
+    Rede feed-forward do NEAT compilada em um "programa" de matrizes NumPy.
+
+    Os valores ficam em um buffer (batch, n_inputs + n_nós): as entradas nas
+    primeiras colunas e cada nó avaliado em ordem topológica nas seguintes.
+    Cada camada de feed_forward_layers vira uma multiplicação de matriz sobre
+    as colunas já calculadas, então um único forward avalia o batch inteiro.
+
+    Suporta agregação 'sum' (a do config.txt); para a ativação 'tanh' do
+    config o resultado é o mesmo de FeedForwardNetwork.activate (a menos de
+    arredondamento da ordem das somas).
+    """
+
+    def __init__(self, n_inputs, steps, output_columns, n_values):
+        self.n_inputs = n_inputs
+        # steps: lista de (coluna_inicial, colunas_lidas, W, bias, response, ativação)
+        self.steps = steps
+        self.output_columns = np.asarray(output_columns, dtype=np.int64)
+        self.n_values = n_values
+        self._allocate_buffers()
+
+    def _allocate_buffers(self):
+        # buffers de activate_one (uma observação por vez): valores e saídas
+        self._values = np.zeros(self.n_values)
+        self._outputs = np.zeros(len(self.output_columns))
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state.pop("_values", None)
+        state.pop("_outputs", None)
+        return state
+
+    def __setstate__(self, state):
+        # os buffers não vão no pickle: são recriados ao carregar (inclusive
+        # em redes salvas antes de existirem)
+        self.__dict__.update(state)
+        self._allocate_buffers()
+
+    @staticmethod
+    def create(genome, config):
+        """Compila um genome (neat.DefaultGenome) como FeedForwardNetwork.create."""
+        from neat.graphs import feed_forward_layers
+
+        genome_config = config.genome_config
+        input_keys = list(genome_config.input_keys)
+        output_keys = list(genome_config.output_keys)
+
+        connections = [cg.key for cg in genome.connections.values() if cg.enabled]
+        layers = feed_forward_layers(input_keys, output_keys, connections)
+
+        column = {key: i for i, key in enumerate(input_keys)}
+        next_column = len(input_keys)
+        steps = []
+
+        for layer in layers:
+            # nós da camada só dependem de colunas anteriores a ela
+            layer_start = next_column
+
+            # um passo por ativação (com o config.txt, um por camada)
+            groups = {}
+            for node in sorted(layer):
+                ng = genome.nodes[node]
+                if ng.aggregation != "sum":
+                    raise ValueError(f"agregação não suportada: {ng.aggregation}")
+                if ng.activation not in ACTIVATIONS:
+                    raise ValueError(f"ativação não suportada: {ng.activation}")
+                groups.setdefault(ng.activation, []).append(node)
+
+            for activation, nodes in groups.items():
+                start = next_column
+                row_of = {}
+                for row, node in enumerate(nodes):
+                    column[node] = next_column
+                    row_of[node] = row
+                    next_column += 1
+
+                W = np.zeros((len(nodes), layer_start))
+                for inode, onode in connections:
+                    if onode in row_of and column.get(inode, layer_start) < layer_start:
+                        W[row_of[onode], column[inode]] += genome.connections[(inode, onode)].weight
+                bias = np.array([genome.nodes[node].bias for node in nodes])
+                response = np.array([genome.nodes[node].response for node in nodes])
+                steps.append((start, layer_start, W, bias, response, ACTIVATIONS[activation]))
+
+        # saídas sem caminho até as entradas ficam em 0.0, como no neat
+        # (apontam para uma coluna extra que nunca é escrita)
+        outputs = [column.get(key, next_column) for key in output_keys]
+        return CompiledNetwork(len(input_keys), steps, outputs, next_column + 1)
+
+    # ---------------------- avaliação ----------------------
+
+    def activate_batch(self, inputs):
+        """inputs (batch, n_inputs) -> saídas (batch, n_outputs)."""
+        inputs = np.asarray(inputs, dtype=np.float64)
+        batch = inputs.shape[0]
+        values = np.zeros((batch, self.n_values))
+        values[:, :self.n_inputs] = inputs
+        for start, layer_start, W, bias, response, activation in self.steps:
+            z = values[:, :layer_start] @ W.T
+            values[:, start:start + W.shape[0]] = activation(bias + response * z)
+        return values[:, self.output_columns]
+
+    def activate_one(self, inputs):
+        """
+        Uma observação (array de n_inputs) -> array de saídas, para o jogo
+        tick a tick: só produtos matriz-vetor sobre os buffers internos. Os
+        valores e as saídas são reescritos no lugar (o array devolvido é o
+        mesmo a cada chamada); os temporários de cada camada ainda são alocados.
+        """
+        values = self._values
+        values[:self.n_inputs] = inputs
+        for start, layer_start, W, bias, response, activation in self.steps:
+            z = W @ values[:layer_start]
+            values[start:start + W.shape[0]] = activation(bias + response * z)
+        return np.take(values, self.output_columns, out=self._outputs)
+
+    def activate(self, inputs):
+        """Mesma interface de FeedForwardNetwork.activate (uma observação)."""
+        if len(inputs) != self.n_inputs:
+            raise RuntimeError(f"Expected {self.n_inputs:n} inputs, got {len(inputs):n}")
+        return self.activate_batch(np.asarray(inputs, dtype=np.float64)[None, :])[0].tolist()
+
+
+def activate_population(networks, inputs):
+    """
+    Avalia uma população contra seus jogos: inputs (P, batch, n_inputs) com
+    as observações dos jogos de cada rede -> saídas (P, batch, n_outputs).
+
+    Só o batch de cada rede é vetorizado: as redes têm topologias diferentes,
+    então é um activate_batch por rede (laço em Python) e os resultados são
+    empilhados no fim.
+    """
+    return np.stack([net.activate_batch(obs) for net, obs in zip(networks, inputs)])
@@ -0,0 +1,114 @@
+"""
+Avaliação headless em massa de genomes salvos, um resultado JSON por linha.
+
+    python -m ALGO_PLAYS.NEAT.evaluate                          # current_best.pickle
+    python -m ALGO_PLAYS.NEAT.evaluate --store -n 200 -w 4      # melhor de cada geração
+    python -m ALGO_PLAYS.NEAT.evaluate a.pickle b.pickle --rows 20 --cols 20
+
+Cada genome vira uma CompiledNetwork e joga 'episodes' jogos em lockstep
+(play_episodes_batched); --serial usa play_episode, um jogo por vez. As
+seeds começam em 1000 por padrão, longe das usadas no treino (0, 1, 2...),
+para medir a rede em jogos que ela não viu.
+"""
+import argparse
+import json
+import multiprocessing
+import os
+import time
+from collections import Counter
+
+from ALGO_PLAYS.NEAT.NEAT import episode_fitness, load_config, play_episode, play_episodes_batched
+from ALGO_PLAYS.NEAT.compiled_net import CompiledNetwork
+from ALGO_PLAYS.NEAT.storage import BestGenomeStore, load_pickle
+
+NEAT_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+def evaluate_genome(path, config_path, rows, cols, episodes=100, seed=1000, max_steps=2000,
+                    n_foods=3, encoder="basic", batched=True):
+    """Joga 'episodes' jogos com o genome salvo em path e resume o resultado."""
+    start = time.perf_counter()
+    genome = load_pickle(path)
+    if genome is None:
+        return {"genome": path, "error": "arquivo ausente, vazio ou corrompido"}
+
+    net = CompiledNetwork.create(genome, load_config(config_path))
+    if batched:
+        results = play_episodes_batched(net, rows, cols, episodes, seed, max_steps, n_foods, encoder)
+    else:
+        results = [
+            play_episode(net, rows, cols, seed + episode, max_steps, n_foods, encoder)
+            for episode in range(episodes)
+        ]
+
+    scores = [score for score, _, _ in results]
+    return {
+        "genome": path,
+        "key": genome.key,
+        "train_fitness": genome.fitness,
+        "episodes": episodes,
+        "fitness": sum(episode_fitness(*result) for result in results) / episodes,
+        "mean_score": sum(scores) / episodes,
+        "max_score": max(scores),
+        "mean_steps": sum(steps for _, steps, _ in results) / episodes,
+        "outcomes": dict(Counter(condition for _, _, condition in results)),
+        "wall_time": round(time.perf_counter() - start, 6),
+    }
+
+
+def _run_job(job):
+    path, extra, kwargs = job
+    return {**extra, **evaluate_genome(path, **kwargs)}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Avaliação headless de genomes NEAT salvos (JSON lines).")
+    parser.add_argument("genomes", nargs="*", help="pickles de genome (padrão: current_best.pickle)")
+    parser.add_argument("--store", action="store_true",
+                        help="avalia o melhor genome de cada geração (checkpoints/best)")
+    parser.add_argument("--config", default=os.path.join(NEAT_DIR, "config.txt"))
+    parser.add_argument("--encoder", default="basic")
+    parser.add_argument("-n", "--episodes", type=int, default=100)
+    parser.add_argument("--seed", type=int, default=1000)
+    parser.add_argument("--rows", type=int, default=30)
+    parser.add_argument("--cols", type=int, default=40)
+    parser.add_argument("--foods", type=int, default=3)
+    parser.add_argument("--max-steps", type=int, default=2000)
+    parser.add_argument("--serial", action="store_true", help="um jogo por vez em vez de lockstep")
+    parser.add_argument("-w", "--workers", type=int, default=1, help="processos (0 = um por CPU)")
+    args = parser.parse_args(argv)
+
+    config_dir = os.path.dirname(os.path.abspath(args.config))
+    jobs = [(path, {}) for path in args.genomes]
+    if args.store:
+        store = BestGenomeStore(os.path.join(config_dir, "checkpoints", "best"))
+        jobs += [(os.path.join(store.directory, e["file"]), {"generation": e["generation"]})
+                 for e in store.entries]
+    if not jobs:
+        jobs = [(os.path.join(config_dir, "current_best.pickle"), {})]
+
+    kwargs = {
+        "config_path": args.config,
+        "rows": args.rows,
+        "cols": args.cols,
+        "episodes": args.episodes,
+        "seed": args.seed,
+        "max_steps": args.max_steps,
+        "n_foods": args.foods,
+        "encoder": args.encoder,
+        "batched": not args.serial,
+    }
+    jobs = [(path, extra, kwargs) for path, extra in jobs]
+
+    workers = args.workers or multiprocessing.cpu_count()
+    if workers > 1:
+        with multiprocessing.Pool(workers) as pool:
+            for result in pool.imap_unordered(_run_job, jobs):
+                print(json.dumps(result), flush=True)
+    else:
+        for job in jobs:
+            print(json.dumps(_run_job(job)), flush=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,273 @@
+"""
+Treino NEAT em ilhas: várias populações evoluindo em processos separados,
+cada uma com seu pool de avaliação, trocando os melhores genomes a cada
+migration_interval gerações.
+
+    python -m ALGO_PLAYS.NEAT.islands 100 --islands 4 --workers 2
+
+A migração é em anel (a ilha i manda para i + 1) por multiprocessing.Queue:
+depois de cada trecho de gerações toda ilha envia seus 'migrants' melhores,
+recebe os da anterior no lugar de filhos ainda não avaliados e refaz a
+especiação. Todas seguem o mesmo calendário (uma Barrier por rodada), então
+quando uma ilha atinge o fitness_threshold todas param juntas.
+
+Com pop_size do config por ilha, o total por geração é ilhas x pop_size e o
+tempo por geração fica no de uma ilha enquanto houver núcleos para elas.
+"""
+import argparse
+import multiprocessing
+import os
+import queue
+import random
+import time
+import traceback
+
+import neat
+
+from ALGO_PLAYS.NEAT.NEAT import NEAT_AI
+from ALGO_PLAYS.NEAT.storage import atomic_pickle
+
+
+class _IslandReporter(neat.reporting.BaseReporter):
+    """Guarda os melhores da última geração avaliada (candidatos a migrar) e se achou solução."""
+
+    def __init__(self, n_best):
+        self.n_best = n_best
+        self.best = []
+        self.best_fitness = None
+        self.generation = None
+        self.solved = False
+
+    def start_generation(self, generation):
+        self.generation = generation
+
+    def post_evaluate(self, config, population, species, best_genome):
+        ranked = sorted(population.values(), key=lambda g: g.fitness, reverse=True)
+        self.best = ranked[:self.n_best]
+        self.best_fitness = best_genome.fitness
+
+    def found_solution(self, config, generation, best):
+        self.solved = True
+
+
+def insert_migrants(population, migrants, rng=random):
+    """
+    Coloca os migrantes no lugar de filhos ainda não avaliados (os elites,
+    que já têm fitness, ficam) e refaz a especiação da população.
+    """
+    genomes = population.population
+    offspring = [key for key, genome in genomes.items() if genome.fitness is None]
+    candidates = offspring if len(offspring) >= len(migrants) else list(genomes)
+    replaced = rng.sample(candidates, min(len(migrants), len(candidates)))
+
+    reproduction = population.reproduction
+    for key, genome in zip(replaced, migrants):
+        del genomes[key]
+        genome.key = next(reproduction.genome_indexer)
+        genome.fitness = None
+        genomes[genome.key] = genome
+        reproduction.ancestors[genome.key] = tuple()
+
+    population.species.speciate(population.config, genomes, population.generation)
+
+
+def _receive(inbox, failed):
+    """inbox.get que desiste se outra ilha falhou (ela nunca vai mandar)."""
+    while True:
+        try:
+            return inbox.get(timeout=1.0)
+        except queue.Empty:
+            if failed.is_set():
+                raise RuntimeError("outra ilha falhou")
+
+
+def _run_island(island, settings, inbox, outbox, results, barrier, stop, failed):
+    """Processo de uma ilha: evolui em trechos de gerações e migra entre eles."""
+    evaluator = None
+    try:
+        # o neat sorteia pelo random global: cada ilha começa de uma população diferente
+        random.seed(settings["seed"] * 1000 + island)
+        rng = random.Random(settings["seed"] * 1000 + island)
+
+        ai = NEAT_AI(
+            settings["rows"], settings["cols"], settings["config_path"],
+            episodes_per_genome=settings["episodes_per_genome"],
+            max_steps=settings["max_steps"],
+            seed=settings["seed"],
+            num_workers=settings["workers_per_island"],
+            n_foods=settings["n_foods"],
+            batched_eval=settings["batched_eval"],
+            encoder=settings["encoder"],
+        )
+        population = neat.Population(ai.config)
+        reporter = _IslandReporter(settings["migrants"])
+        population.add_reporter(reporter)
+
+        if settings["workers_per_island"] > 1:
+            evaluator = neat.ParallelEvaluator(settings["workers_per_island"], ai._genome_evaluator())
+            evaluate = evaluator.evaluate
+        else:
+            evaluate = ai._evaluate_genomes
+
+        n_generations = settings["n_generations"]
+        interval = settings["migration_interval"]
+        done = 0
+        while done < n_generations:
+            start = time.perf_counter()
+            population.run(evaluate, min(interval, n_generations - done))
+            done += min(interval, n_generations - done)
+            results.put(("generation", island, reporter.generation,
+                         reporter.best_fitness, time.perf_counter() - start))
+            if reporter.solved:
+                stop.set()
+
+            if done < n_generations and outbox is not None:
+                outbox.put(reporter.best)
+                insert_migrants(population, _receive(inbox, failed), rng)
+
+            barrier.wait()
+            if stop.is_set():
+                break
+
+        results.put(("done", island, population.best_genome))
+    except Exception:
+        failed.set()
+        barrier.abort()
+        results.put(("error", island, traceback.format_exc()))
+    finally:
+        if evaluator is not None:
+            evaluator.pool.terminate()
+
+
+class IslandTrainer:
+    """
+    Modelo de ilhas sobre o NEAT_AI: n_islands populações (cada uma com o
+    pop_size do config) em processos próprios, cada processo com
+    workers_per_island processos avaliando genomes (neat.ParallelEvaluator).
+    """
+
+    def __init__(self, rows, cols, config_path, n_islands=4, workers_per_island=1,
+                 migration_interval=5, migrants=2, seed=0, episodes_per_genome=3,
+                 max_steps=2000, n_foods=3, batched_eval=False, encoder="basic"):
+        self.rows = rows
+        self.cols = cols
+        self.config_path = config_path
+        self.n_islands = n_islands
+        self.workers_per_island = workers_per_island
+        self.migration_interval = migration_interval
+        self.migrants = migrants
+        self.seed = seed
+        self.episodes_per_genome = episodes_per_genome
+        self.max_steps = max_steps
+        self.n_foods = n_foods
+        self.batched_eval = batched_eval
+        self.encoder = encoder
+
+        # mesmo arquivo do NEAT_AI: o jogo carrega o vencedor daqui
+        self.best_path = os.path.join(os.path.dirname(config_path), "current_best.pickle")
+        self.best_genome = None
+        # (ilha, geração, melhor fitness, segundos do trecho) de cada trecho
+        self.history = []
+
+    def _settings(self, n_generations):
+        return {
+            "rows": self.rows,
+            "cols": self.cols,
+            "config_path": self.config_path,
+            "n_generations": n_generations,
+            "migration_interval": self.migration_interval,
+            "migrants": self.migrants,
+            "seed": self.seed,
+            "workers_per_island": self.workers_per_island,
+            "episodes_per_genome": self.episodes_per_genome,
+            "max_steps": self.max_steps,
+            "n_foods": self.n_foods,
+            "batched_eval": self.batched_eval,
+            "encoder": self.encoder,
+        }
+
+    def train(self, n_generations=50, verbose=True):
+        """Roda as ilhas até n_generations (ou o fitness_threshold) e salva o melhor genome."""
+        n = self.n_islands
+        settings = self._settings(n_generations)
+        inboxes = [multiprocessing.Queue() for _ in range(n)]
+        results = multiprocessing.Queue()
+        barrier = multiprocessing.Barrier(n)
+        stop = multiprocessing.Event()
+        failed = multiprocessing.Event()
+
+        processes = []
+        for island in range(n):
+            # anel: a ilha i recebe de i - 1 e manda para i + 1
+            outbox = inboxes[(island + 1) % n] if n > 1 else None
+            process = multiprocessing.Process(
+                target=_run_island,
+                args=(island, settings, inboxes[island], outbox, results, barrier, stop, failed),
+            )
+            process.start()
+            processes.append(process)
+
+        bests = []
+        try:
+            while len(bests) < n:
+                try:
+                    message = results.get(timeout=1.0)
+                except queue.Empty:
+                    if any(p.exitcode not in (None, 0) for p in processes):
+                        raise RuntimeError("um processo de ilha morreu sem reportar")
+                    continue
+
+                kind, island = message[0], message[1]
+                if kind == "error":
+                    raise RuntimeError(f"ilha {island} falhou:\n{message[2]}")
+                if kind == "generation":
+                    _, _, generation, best_fitness, elapsed = message
+                    self.history.append((island, generation, best_fitness, elapsed))
+                    if verbose:
+                        print(f"ilha {island} geração {generation}: melhor {best_fitness:.2f} ({elapsed:.1f}s)")
+                else:
+                    bests.append(message[2])
+        except BaseException:
+            failed.set()
+            for process in processes:
+                process.terminate()
+            raise
+        finally:
+            for process in processes:
+                process.join()
+
+        winner = max(bests, key=lambda g: g.fitness)
+        atomic_pickle(winner, self.best_path)
+        self.best_genome = winner
+        return winner
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Treino NEAT em ilhas com migração.")
+    parser.add_argument("generations", type=int, nargs="?", default=50)
+    parser.add_argument("--islands", type=int, default=4)
+    parser.add_argument("--workers", type=int, default=1, help="processos de avaliação por ilha")
+    parser.add_argument("--interval", type=int, default=5, help="gerações entre migrações")
+    parser.add_argument("--migrants", type=int, default=2, help="genomes enviados por migração")
+    parser.add_argument("--rows", type=int, default=30)
+    parser.add_argument("--cols", type=int, default=40)
+    parser.add_argument("--config", default=os.path.join(os.path.dirname(os.path.abspath(__file__)), "config.txt"))
+    parser.add_argument("--encoder", default="basic")
+    parser.add_argument("--batched", action="store_true", help="avalia os episódios com a rede compilada")
+    args = parser.parse_args(argv)
+
+    trainer = IslandTrainer(
+        args.rows, args.cols, args.config,
+        n_islands=args.islands,
+        workers_per_island=args.workers,
+        migration_interval=args.interval,
+        migrants=args.migrants,
+        batched_eval=args.batched,
+        encoder=args.encoder,
+    )
+    winner = trainer.train(args.generations)
+    print(f"melhor genome: {winner.key} fitness {winner.fitness:.2f} -> {trainer.best_path}")
+
+
+if __name__ == "__main__":
+    main()
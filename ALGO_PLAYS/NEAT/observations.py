@@ -0,0 +1,336 @@
+import math
+import re
+
+import numpy as np
+
+from ALGO_PLAYS.game_info import game_info
+
+# ordem das orientações (mesma de SnakeEngine.DIRECTIONS e BatchSnakeEnv)
+ORIENTATIONS = ("up", "down", "left", "right")
+
+# 8 direções dos raios: as 4 da rede e as diagonais
+RAY_DIRECTIONS = (
+    (-1, 0), (1, 0), (0, -1), (0, 1),     # up, down, left, right
+    (-1, -1), (-1, 1), (1, -1), (1, 1),   # up-left, up-right, down-left, down-right
+)
+
+
+# --------------------------------------------------------------------------
+#  ENCODER ORIGINAL (9 ENTRADAS)
+# --------------------------------------------------------------------------
+
+def encode_inputs(info: game_info):
+    """
+    Entradas da rede a partir do game_info:
+      - posição normalizada da cabeça
+      - posição normalizada da primeira comida (se existir)
+      - orientação atual (one-hot)
+      - tamanho atual da snake (normalizado)
+    """
+    head_r, head_c = info.snake_positions[0]
+
+    # normaliza posições em [0, 1]
+    head_r_n = head_r / max(1, info.rows - 1)
+    head_c_n = head_c / max(1, info.cols - 1)
+
+    # primeira food (se tiver)
+    if info.food_positions:
+        f_r, f_c = info.food_positions[0]
+        food_r_n = f_r / max(1, info.rows - 1)
+        food_c_n = f_c / max(1, info.cols - 1)
+    else:
+        food_r_n = 0.0
+        food_c_n = 0.0
+
+    # orientação one-hot
+    ori_up = 1.0 if info.orientation == "up" else 0.0
+    ori_down = 1.0 if info.orientation == "down" else 0.0
+    ori_left = 1.0 if info.orientation == "left" else 0.0
+    ori_right = 1.0 if info.orientation == "right" else 0.0
+
+    # tamanho da snake
+    size_n = len(info.snake_positions) / float(info.rows * info.cols)
+
+    return [
+        head_r_n,
+        head_c_n,
+        food_r_n,
+        food_c_n,
+        ori_up,
+        ori_down,
+        ori_left,
+        ori_right,
+        size_n,
+    ]
+
+
+def encode_inputs_batch(env):
+    """encode_inputs para todos os jogos de um BatchSnakeEnv: (N, 9)."""
+    rows, cols = env.rows, env.cols
+    obs = np.zeros((env.n_games, 9))
+
+    obs[:, 0] = (env.head // cols) / max(1, rows - 1)
+    obs[:, 1] = (env.head % cols) / max(1, cols - 1)
+
+    # primeira food existente de cada jogo (como game_info.food_positions[0])
+    has_food = env.foods >= 0
+    first = env.foods[np.arange(env.n_games), has_food.argmax(axis=1)]
+    valid = has_food.any(axis=1)
+    obs[valid, 2] = (first[valid] // cols) / max(1, rows - 1)
+    obs[valid, 3] = (first[valid] % cols) / max(1, cols - 1)
+
+    # orientação one-hot na ordem up, down, left, right
+    obs[np.arange(env.n_games), 4 + env.orientation] = 1.0
+
+    # tamanho conta o crescimento pendente (a cauda duplicada do grow_snake)
+    obs[:, 8] = (env.length + env.pending) / float(rows * cols)
+    return obs
+
+
+# --------------------------------------------------------------------------
+#  ENCODERS PLUGÁVEIS
+# --------------------------------------------------------------------------
+
+class BasicEncoder:
+    """As 9 entradas originais (encode_inputs), compatível com o config.txt."""
+
+    name = "basic"
+    num_inputs = 9
+
+    def __init__(self, rows, cols):
+        self.rows = rows
+        self.cols = cols
+
+    def encode(self, engine, out=None):
+        return self.encode_info(engine.info, out)
+
+    def encode_info(self, info: game_info, out=None):
+        obs = encode_inputs(info)
+        if out is None:
+            return obs
+        out[:] = obs
+        return out
+
+    def encode_batch(self, env, out=None):
+        obs = encode_inputs_batch(env)
+        if out is None:
+            return obs
+        out[:] = obs
+        return out
+
+
+class RayEncoder:
+    """
+    Observação com raios, como um sensor: a partir da cabeça, nas 8 direções
+    de RAY_DIRECTIONS e com wrap nas bordas, a distância até o primeiro
+    pedaço do corpo e até a primeira food (1 / passos, 0 se o raio não acha).
+
+    Entradas (27):
+      [0:8]   raios até o corpo
+      [8:16]  raios até uma food
+      [16:20] perigo imediato em up, down, left, right (a cauda que vai
+              andar neste tick não conta)
+      [20:22] vetor (linha, coluna) até a food mais próxima com wrap, em [-1, 1]
+      [22:26] orientação atual (one-hot)
+      [26]    tamanho da snake (normalizado)
+
+    Tudo que depende só do tabuleiro é pré-calculado:
+      - as células de cada raio, por linha e por coluna (row_table[r] +
+        col_table[c]); um encode lê (8, alcance) da ocupação de uma vez,
+        O(raios x distância) em NumPy sem laço Python por célula
+      - inverse_at[d, deslocamento]: 1 / passos até o deslocamento (com wrap)
+        cabeça -> célula pelo raio d, então cada food custa uma leitura
+    encode_batch faz o mesmo para (N, 8, alcance) de uma vez.
+    """
+
+    name = "rays"
+    num_inputs = 27
+
+    def __init__(self, rows, cols):
+        if rows < 2 or cols < 2:
+            raise ValueError("os raios precisam de um grid de pelo menos 2x2")
+        self.rows = rows
+        self.cols = cols
+        self.n_cells = rows * cols
+
+        # alcance de cada raio: até voltar à cabeça (no toro), no máximo max(rows, cols)
+        reach = max(rows, cols)
+        steps = np.arange(1, reach + 1)
+        ray_dr = np.zeros((8, reach), dtype=np.int64)
+        ray_dc = np.zeros((8, reach), dtype=np.int64)
+        self.inverse_at = np.zeros((8, self.n_cells))
+        for d, (dr, dc) in enumerate(RAY_DIRECTIONS):
+            period = rows if dc == 0 else cols if dr == 0 else math.lcm(rows, cols)
+            # depois do alcance o raio repete a última célula: não muda o primeiro acerto
+            k = np.minimum(steps, min(period - 1, reach))
+            ray_dr[d] = dr * k
+            ray_dc[d] = dc * k
+            for step in range(min(period - 1, reach), 0, -1):
+                offset = (dr * step) % rows * cols + (dc * step) % cols
+                self.inverse_at[d, offset] = 1.0 / step
+
+        self.row_table = ((np.arange(rows)[:, None, None] + ray_dr) % rows) * cols   # (rows, 8, alcance)
+        self.col_table = (np.arange(cols)[:, None, None] + ray_dc) % cols            # (cols, 8, alcance)
+        self.inverse = 1.0 / steps
+        self._directions = np.arange(8)
+
+    # ---------------------- um jogo ----------------------
+
+    def encode(self, engine, out=None):
+        """Observação de um SnakeEngine, lendo a ocupação da snake sem cópia."""
+        player_snake = engine.player_snake
+        occupancy = np.frombuffer(player_snake.occupancy, dtype=np.uint8)
+        return self._encode_one(
+            occupancy,
+            player_snake.POS,
+            player_snake.body[-1],
+            player_snake.orientation,
+            engine.food_positions(),
+            len(player_snake.body),
+            out,
+        )
+
+    def encode_info(self, info: game_info, out=None):
+        """Observação a partir do game_info (monta a ocupação em O(tamanho))."""
+        if not info.snake_positions:
+            obs = out if out is not None else np.empty(self.num_inputs)
+            obs[:] = 0.0
+            return obs
+        occupancy = np.zeros(self.n_cells, dtype=np.uint8)
+        cells = [r * self.cols + c for r, c in info.snake_positions]
+        np.add.at(occupancy, cells, 1)
+        return self._encode_one(
+            occupancy,
+            info.snake_positions[0],
+            info.snake_positions[-1],
+            info.orientation,
+            info.food_positions,
+            len(info.snake_positions),
+            out,
+        )
+
+    def _encode_one(self, occupancy, head, tail, orientation, food_positions, length, out=None):
+        rows, cols = self.rows, self.cols
+        head_r, head_c = head
+        obs = out if out is not None else np.empty(self.num_inputs)
+        obs[:] = 0.0
+
+        rays = self.row_table[head_r] + self.col_table[head_c]              # (8, alcance)
+        hits = occupancy[rays] != 0
+        first = hits.argmax(axis=1)
+        obs[0:8] = self.inverse[first] * hits[self._directions, first]
+
+        if food_positions:
+            offsets = []
+            nearest = None
+            for f_r, f_c in food_positions:
+                d_r = (f_r - head_r) % rows
+                d_c = (f_c - head_c) % cols
+                offsets.append(d_r * cols + d_c)
+                # deslocamento com wrap em [-rows/2, rows/2)
+                d_r = (d_r + rows // 2) % rows - rows // 2
+                d_c = (d_c + cols // 2) % cols - cols // 2
+                if nearest is None or abs(d_r) + abs(d_c) < abs(nearest[0]) + abs(nearest[1]):
+                    nearest = (d_r, d_c)
+            obs[8:16] = self.inverse_at[:, offsets].max(axis=1)
+            obs[20] = nearest[0] / max(1, rows // 2)
+            obs[21] = nearest[1] / max(1, cols // 2)
+
+        # perigo: vizinho ocupado, exceto a cauda que sai neste tick
+        # (com crescimento pendente a cauda está duplicada: ocupação 2)
+        tail_cell = tail[0] * cols + tail[1]
+        for k, cell in enumerate(rays[0:4, 0].tolist()):
+            if occupancy[cell] and not (cell == tail_cell and occupancy[cell] == 1):
+                obs[16 + k] = 1.0
+
+        obs[22 + ORIENTATIONS.index(orientation)] = 1.0
+        obs[26] = length / float(self.n_cells)
+        return obs
+
+    # ---------------------- lote (BatchSnakeEnv) ----------------------
+
+    def encode_batch(self, env, out=None):
+        """Observações (N, 27) de todos os jogos de um BatchSnakeEnv."""
+        rows, cols = self.rows, self.cols
+        n = env.n_games
+        games = np.arange(n)
+        obs = out if out is not None else np.empty((n, self.num_inputs))
+        obs[:] = 0.0
+
+        head_r = env.head // cols
+        head_c = env.head % cols
+        rays = self.row_table[head_r] + self.col_table[head_c]              # (N, 8, alcance)
+
+        hits = env.occupancy[games[:, None, None], rays] != 0
+        first = hits.argmax(axis=2)
+        found = np.take_along_axis(hits, first[:, :, None], axis=2)[:, :, 0]
+        obs[:, 0:8] = self.inverse[first] * found
+
+        foods = env.foods                                                   # (N, F), -1 = sem food
+        has_food = foods >= 0
+        d_r = (foods // cols - head_r[:, None]) % rows
+        d_c = (foods % cols - head_c[:, None]) % cols
+        seen = self.inverse_at[:, d_r * cols + d_c] * has_food              # (8, N, F)
+        obs[:, 8:16] = seen.max(axis=2).T
+
+        d_r = (d_r + rows // 2) % rows - rows // 2
+        d_c = (d_c + cols // 2) % cols - cols // 2
+        distance = np.where(has_food, np.abs(d_r) + np.abs(d_c), np.iinfo(np.int64).max)
+        nearest = distance.argmin(axis=1)
+        any_food = has_food.any(axis=1)
+        obs[:, 20] = np.where(any_food, d_r[games, nearest] / max(1, rows // 2), 0.0)
+        obs[:, 21] = np.where(any_food, d_c[games, nearest] / max(1, cols // 2), 0.0)
+
+        # a cauda só sai do lugar se não há crescimento pendente
+        neighbors = rays[:, 0:4, 0]
+        danger = env.occupancy[games[:, None], neighbors] != 0
+        tail_slot = (env.head_ptr - env.length + 1) % env.n_cells
+        tail_cell = env.body[games, tail_slot]
+        tail_leaves = (neighbors == tail_cell[:, None]) & (env.pending == 0)[:, None]
+        obs[:, 16:20] = danger & ~tail_leaves
+
+        obs[games, 22 + env.orientation] = 1.0
+        obs[:, 26] = (env.length + env.pending) / float(self.n_cells)
+        return obs
+
+
+ENCODERS = {
+    BasicEncoder.name: BasicEncoder,
+    RayEncoder.name: RayEncoder,
+}
+
+
+def make_encoder(name, rows, cols):
+    """Encoder pelo nome ("basic" ou "rays")."""
+    try:
+        return ENCODERS[name](rows, cols)
+    except KeyError:
+        raise ValueError(f"encoder desconhecido: {name}") from None
+
+
+# --------------------------------------------------------------------------
+#  CONFIG DO NEAT COM O num_inputs DO ENCODER
+# --------------------------------------------------------------------------
+
+def write_config(template_path, out_path, encoder, **overrides):
+    """
+    Copia o config do NEAT trocando num_inputs pelo do encoder (e qualquer
+    outra chave em overrides, ex. fitness_threshold=500.0). Mantém o resto
+    do arquivo, comentários e alinhamento incluídos.
+    """
+    values = {"num_inputs": encoder.num_inputs, **overrides}
+    pattern = re.compile(r"^(\s*)(\w+)(\s*=\s*).*$")
+
+    lines = []
+    with open(template_path) as f:
+        for line in f.read().splitlines():
+            match = pattern.match(line)
+            if match and match.group(2) in values:
+                line = f"{match.group(1)}{match.group(2)}{match.group(3)}{values[match.group(2)]}"
+            elif line.startswith("# Estrutura:"):
+                line = f"# Estrutura: {encoder.num_inputs} inputs ({encoder.name}), 4 outputs (up, down, left, right)"
+            lines.append(line)
+
+    with open(out_path, "w") as f:
+        f.write("\n".join(lines) + "\n")
+    return out_path
@@ -0,0 +1,285 @@
+"""
+Persistência do treino NEAT à prova de crash.
+
+  - atomic_write / atomic_pickle: escreve em um arquivo temporário no mesmo
+    diretório, fsync e os.replace; quem lê vê o arquivo antigo ou o novo,
+    nunca um pela metade (um kill no meio deixa só um .tmp para trás)
+  - PopulationCheckpointer: reporter que salva a população no fim de cada
+    geração (mesmo formato do neat.Checkpointer) e retoma do mais recente
+  - BestGenomeStore: melhor genome de cada geração + index.json com fitness
+  - CompiledNetCache: a CompiledNetwork do melhor genome já compilada, válida
+    enquanto o genome e o config forem os mesmos
+
+Nada aqui importa o neat no topo: carregar a rede para jogar só precisa do
+pickle da CompiledNetwork (NumPy).
+"""
+import gzip
+import hashlib
+import json
+import os
+import pickle
+import random
+import re
+import tempfile
+import time
+
+
+# --------------------------------------------------------------------------
+#  ESCRITA ATÔMICA
+# --------------------------------------------------------------------------
+
+def atomic_write(path, data):
+    """Grava bytes em path de forma atômica (temporário + fsync + rename)."""
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=os.path.basename(path) + ".", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+def atomic_pickle(obj, path):
+    atomic_write(path, pickle.dumps(obj, protocol=pickle.HIGHEST_PROTOCOL))
+
+
+def load_pickle(path, default=None):
+    """pickle.load de path, ou default se o arquivo não existe, está vazio ou corrompido."""
+    try:
+        with open(path, "rb") as f:
+            return pickle.load(f)
+    except (OSError, EOFError, pickle.UnpicklingError):
+        return default
+
+
+# --------------------------------------------------------------------------
+#  REPORTERS
+# --------------------------------------------------------------------------
+
+class ReporterBase:
+    """Mesma interface do neat.reporting.BaseReporter (sem importar o neat)."""
+
+    def start_generation(self, generation):
+        pass
+
+    def end_generation(self, config, population, species_set):
+        pass
+
+    def post_evaluate(self, config, population, species, best_genome):
+        pass
+
+    def post_reproduction(self, config, population, species):
+        pass
+
+    def complete_extinction(self):
+        pass
+
+    def found_solution(self, config, generation, best):
+        pass
+
+    def species_stagnant(self, sid, species):
+        pass
+
+    def info(self, msg):
+        pass
+
+
+class PopulationCheckpointer(ReporterBase):
+    """
+    Salva o estado da população a cada 'interval' gerações, no fim da geração
+    (já reproduzida e especiada: a próxima a avaliar). Um treino morto perde
+    no máximo a geração em andamento.
+
+    O arquivo é o mesmo do neat.Checkpointer (gzip de (geração, config,
+    população, species_set, estado do random)), gravado de forma atômica;
+    só os 'keep' mais recentes ficam no diretório.
+    """
+
+    PREFIX = "neat-checkpoint-"
+
+    def __init__(self, directory, interval=1, keep=3):
+        self.directory = directory
+        self.interval = interval
+        self.keep = keep
+        self._generation = None
+        self._last_saved = None
+        os.makedirs(directory, exist_ok=True)
+
+    def start_generation(self, generation):
+        self._generation = generation
+
+    def end_generation(self, config, population, species_set):
+        if self._last_saved is None or self._generation - self._last_saved >= self.interval:
+            # o estado salvo é o do início da próxima geração
+            self.save(config, population, species_set, self._generation + 1)
+            self._last_saved = self._generation
+
+    def save(self, config, population, species_set, generation):
+        data = (generation, config, population, species_set, random.getstate())
+        payload = gzip.compress(pickle.dumps(data, protocol=pickle.HIGHEST_PROTOCOL), compresslevel=5)
+        atomic_write(self._path(generation), payload)
+        # só os checkpoints até esta geração são deste treino (clear() apaga
+        # os de outro treino ao começar do zero)
+        current = [g for g in self.generations() if g <= generation]
+        for old in current[:-self.keep]:
+            os.remove(self._path(old))
+
+    def clear(self):
+        """Apaga todos os checkpoints do diretório (treino novo, sem retomar)."""
+        for generation in self.generations():
+            os.remove(self._path(generation))
+        self._last_saved = None
+
+    def generations(self):
+        """Gerações com checkpoint no diretório, em ordem crescente."""
+        pattern = re.compile(re.escape(self.PREFIX) + r"(\d+)$")
+        found = []
+        for name in os.listdir(self.directory):
+            match = pattern.match(name)
+            if match:
+                found.append(int(match.group(1)))
+        return sorted(found)
+
+    def latest(self):
+        """Caminho do checkpoint mais recente (ou None)."""
+        generations = self.generations()
+        return self._path(generations[-1]) if generations else None
+
+    def restore(self, path, config=None):
+        """
+        neat.Population retomada do checkpoint (restaura também o random).
+        Com config, usa ele no lugar do config salvo no arquivo.
+        """
+        import neat
+
+        with gzip.open(path) as f:
+            generation, saved_config, population, species_set, random_state = pickle.load(f)
+        random.setstate(random_state)
+        return neat.Population(config or saved_config, (population, species_set, generation))
+
+    def _path(self, generation):
+        return os.path.join(self.directory, f"{self.PREFIX}{generation}")
+
+
+class BestGenomeStore(ReporterBase):
+    """
+    Melhor genome de cada geração em gen-NNNNN.pickle, com um index.json:
+        {"entries": [{"generation", "key", "fitness", "nodes", "connections",
+                      "file", "saved_at"}, ...]}
+    Como reporter, grava o melhor de cada geração logo depois da avaliação.
+    """
+
+    INDEX = "index.json"
+
+    def __init__(self, directory):
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+        self._generation = None
+        self.entries = self._read_index()
+
+    def _read_index(self):
+        try:
+            with open(os.path.join(self.directory, self.INDEX)) as f:
+                return json.load(f)["entries"]
+        except (OSError, ValueError, KeyError):
+            return []
+
+    def add(self, generation, genome):
+        name = f"gen-{generation:05d}.pickle"
+        atomic_pickle(genome, os.path.join(self.directory, name))
+        entry = {
+            "generation": generation,
+            "key": genome.key,
+            "fitness": genome.fitness,
+            "nodes": len(genome.nodes),
+            "connections": sum(1 for cg in genome.connections.values() if cg.enabled),
+            "file": name,
+            "saved_at": time.time(),
+        }
+        # retomando de um checkpoint a mesma geração pode ser avaliada de novo
+        self.entries = [e for e in self.entries if e["generation"] != generation] + [entry]
+        self.entries.sort(key=lambda e: e["generation"])
+        atomic_write(os.path.join(self.directory, self.INDEX),
+                     json.dumps({"entries": self.entries}, indent=1).encode())
+
+    def clear(self):
+        """Esquece os genomes salvos (treino novo: nada de outro treino entra na comparação)."""
+        for entry in self.entries:
+            path = os.path.join(self.directory, entry["file"])
+            if os.path.exists(path):
+                os.remove(path)
+        self.entries = []
+        atomic_write(os.path.join(self.directory, self.INDEX),
+                     json.dumps({"entries": self.entries}, indent=1).encode())
+
+    def best_entry(self):
+        scored = [e for e in self.entries if e["fitness"] is not None]
+        return max(scored, key=lambda e: e["fitness"]) if scored else None
+
+    def load(self, generation=None):
+        """Genome de uma geração, ou o de maior fitness entre todas (None se não há)."""
+        if generation is None:
+            entry = self.best_entry()
+        else:
+            entry = next((e for e in self.entries if e["generation"] == generation), None)
+        if entry is None:
+            return None
+        return load_pickle(os.path.join(self.directory, entry["file"]))
+
+    # ---------------------- reporter ----------------------
+
+    def start_generation(self, generation):
+        self._generation = generation
+
+    def post_evaluate(self, config, population, species, best_genome):
+        self.add(self._generation, best_genome)
+
+
+# --------------------------------------------------------------------------
+#  CACHE DA REDE COMPILADA
+# --------------------------------------------------------------------------
+
+class CompiledNetCache:
+    """
+    CompiledNetwork do genome em genome_path, guardada em cache_path junto
+    com o hash dos bytes do genome e do config: trocar qualquer um dos dois
+    invalida o cache sozinho. FORMAT entra no arquivo e invalida caches
+    gravados por uma CompiledNetwork de outro formato (aumente ao mudá-la).
+    """
+
+    FORMAT = 2
+
+    def __init__(self, genome_path, config_path, cache_path=None):
+        self.genome_path = genome_path
+        self.config_path = config_path
+        self.cache_path = cache_path or os.path.splitext(genome_path)[0] + ".net.pickle"
+
+    def digest(self):
+        """Hash de genome + config (None se o genome ainda não existe)."""
+        sha = hashlib.sha256()
+        try:
+            for path in (self.genome_path, self.config_path):
+                with open(path, "rb") as f:
+                    sha.update(f.read())
+        except OSError:
+            return None
+        return sha.hexdigest()
+
+    def load(self):
+        """A rede em cache, se ainda corresponde ao genome e ao config; senão None."""
+        cached = load_pickle(self.cache_path)
+        if (not isinstance(cached, dict) or cached.get("format") != self.FORMAT
+                or cached.get("digest") != self.digest()):
+            return None
+        return cached.get("net")
+
+    def save(self, net):
+        digest = self.digest()
+        if digest is not None:
+            atomic_pickle({"format": self.FORMAT, "digest": digest, "net": net}, self.cache_path)
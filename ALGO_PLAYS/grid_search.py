@@ -0,0 +1,373 @@
+import heapq
+from array import array
+from collections import deque
+
+
+class GridAStar:
+    """
+    A* sobre índices planos de célula (r * cols + c) com buffers pré-alocados.
+
+    - vizinhos pré-calculados em uma tabela (4 por célula, -1 = fora do grid)
+    - g e parent em arrays do tamanho do grid, reaproveitados entre buscas
+    - "gerações" (stamps) no lugar de limpar os arrays: uma célula só vale
+      para a busca atual se seu stamp for igual à geração corrente
+    - heap de tuplas (f, desempate, célula) e lazy deletion: entradas velhas
+      de células já fechadas são descartadas no pop, e só empurramos um
+      vizinho quando o novo g é melhor que o já conhecido
+    """
+
+    DIRECTIONS = ((-1, 0), (1, 0), (0, -1), (0, 1))
+
+    def __init__(self, rows, cols, wrap=False):
+        self.rows = rows
+        self.cols = cols
+        self.wrap = wrap
+        n = rows * cols
+        self.n_cells = n
+
+        self.row_of = array("l", (i // cols for i in range(n)))
+        self.col_of = array("l", (i % cols for i in range(n)))
+
+        neighbors = array("l", [-1]) * (4 * n)
+        for i in range(n):
+            r, c = divmod(i, cols)
+            for k, (dr, dc) in enumerate(self.DIRECTIONS):
+                nr, nc = r + dr, c + dc
+                if wrap:
+                    nr %= rows
+                    nc %= cols
+                elif not (0 <= nr < rows and 0 <= nc < cols):
+                    continue
+                neighbors[4 * i + k] = nr * cols + nc
+        self.neighbors = neighbors
+
+        self.g = array("l", [0]) * n
+        self.parent = array("l", [-1]) * n
+        self._seen = array("l", [0]) * n      # g/parent valem nesta geração
+        self._closed = array("l", [0]) * n    # célula expandida nesta geração
+        self._blocked = array("l", [0]) * n   # obstáculo na geração de obstáculos
+        self._generation = 0
+        self._obstacle_generation = 0
+
+        # busca temporal: free_at[c] = primeiro passo em que c fica livre
+        self._free_at = array("l", [0]) * n
+        self._free_stamp = array("l", [0]) * n
+        self._free_generation = 0
+        self._horizon = 0
+        # buffers da busca temporal, um slot por estado (ver search_timed);
+        # crescem com o horizonte e usam as mesmas gerações da busca estática
+        self._timed_size = 0
+        self._timed_g = array("l")
+        self._timed_parent = array("l")
+        self._timed_seen = array("l")
+        self._timed_closed = array("l")
+
+        # nós expandidos na última busca e acumulado desde a criação
+        # (células visitadas, no caso dos campos de distância)
+        self.expansions = 0
+        self.total_expansions = 0
+
+    # ---------------------- obstáculos ----------------------
+
+    def set_obstacles(self, obstacles):
+        """Define os obstáculos (iterável de (row, col)) para as próximas buscas."""
+        self._obstacle_generation += 1
+        stamp = self._obstacle_generation
+        blocked = self._blocked
+        cols = self.cols
+        for r, c in obstacles:
+            blocked[r * cols + c] = stamp
+
+    def is_blocked(self, cell):
+        return self._blocked[cell] == self._obstacle_generation
+
+    def set_body(self, body):
+        """
+        Prepara a busca temporal a partir do corpo (cabeça -> cauda), uma vez
+        por plano: a parte de índice i sai da célula em len(body) - i passos.
+        Com a cauda duplicada (grow_snake) vale o maior valor da célula.
+        """
+        self._free_generation += 1
+        gen = self._free_generation
+        free_at, stamp = self._free_at, self._free_stamp
+        cols = self.cols
+        length = len(body)
+        for index, (r, c) in enumerate(body):
+            cell = r * cols + c
+            turns_to_clear = length - index
+            if stamp[cell] != gen or free_at[cell] < turns_to_clear:
+                free_at[cell] = turns_to_clear
+                stamp[cell] = gen
+        self._horizon = length
+
+    def free_at(self, cell):
+        """Primeiro passo em que a célula está livre (0 = já está livre)."""
+        if self._free_stamp[cell] != self._free_generation:
+            return 0
+        return self._free_at[cell]
+
+    # ---------------------- heurística ----------------------
+
+    def heuristic(self, a, b):
+        """Manhattan entre células planas (com wrap se o grid for toroidal)."""
+        dr = abs(self.row_of[a] - self.row_of[b])
+        dc = abs(self.col_of[a] - self.col_of[b])
+        if self.wrap:
+            dr = min(dr, self.rows - dr)
+            dc = min(dc, self.cols - dc)
+        return dr + dc
+
+    # ---------------------- busca ----------------------
+
+    def search(self, start, end):
+        """
+        A* de start até end (tuplas (row, col)) com os obstáculos atuais.
+        Retorna: (caminho_lista, custo) ou (None, infinity) se falhar,
+        no mesmo formato de A_Star.a_star_search (custo = len(caminho)).
+        """
+        cols = self.cols
+        s = start[0] * cols + start[1]
+        t = end[0] * cols + end[1]
+
+        self._generation += 1
+        gen = self._generation
+        bgen = self._obstacle_generation
+        g, parent = self.g, self.parent
+        seen, closed, blocked = self._seen, self._closed, self._blocked
+        neighbors = self.neighbors
+        row_of, col_of = self.row_of, self.col_of
+        rows, wrap = self.rows, self.wrap
+        tr, tc = row_of[t], col_of[t]
+        push, pop = heapq.heappush, heapq.heappop
+
+        g[s] = 0
+        parent[s] = -1
+        seen[s] = gen
+        open_list = [(self.heuristic(s, t), 0, s)]
+        expansions = 0
+
+        while open_list:
+            _, _, cur = pop(open_list)
+            if closed[cur] == gen:
+                continue  # entrada velha (lazy deletion)
+            closed[cur] = gen
+            expansions += 1
+
+            if cur == t:
+                self.expansions = expansions
+                self.total_expansions += expansions
+                return self._build_path(cur)
+
+            ng = g[cur] + 1
+            base = 4 * cur
+            for k in range(4):
+                nb = neighbors[base + k]
+                if nb < 0 or blocked[nb] == bgen or closed[nb] == gen:
+                    continue
+                if seen[nb] == gen and g[nb] <= ng:
+                    continue
+                seen[nb] = gen
+                g[nb] = ng
+                parent[nb] = cur
+
+                dr = abs(row_of[nb] - tr)
+                dc = abs(col_of[nb] - tc)
+                if wrap:
+                    if dr > rows - dr:
+                        dr = rows - dr
+                    if dc > cols - dc:
+                        dc = cols - dc
+                # desempate: entre f iguais, prefere o nó mais profundo
+                push(open_list, (ng + dr + dc, -ng, nb))
+
+        self.expansions = expansions
+        self.total_expansions += expansions
+        return None, float('inf')
+
+    def search_timed(self, start, end, t0=0, max_expansions=None):
+        """
+        A* no espaço (célula, tempo) usando o corpo de set_body: entrar em uma
+        célula no passo t só vale se t >= free_at(célula). Assim uma chegada
+        mais tarde a uma célula não é bloqueada por uma chegada anterior.
+        t0: passos já decorridos desde o snapshot do corpo.
+
+        A partir do horizonte (tamanho do corpo) todo o corpo já saiu, então o
+        tempo é saturado nele e o espaço de estados fica limitado.
+
+        A expansão depende só do estado (célula, tempo, direção de entrada):
+        free_at para o corpo do snapshot e, do corpo novo (o próprio caminho),
+        só a volta de 180° para a célula anterior. O resto do corpo novo
+        depende do histórico inteiro e não cabe no estado, então é conferido
+        quando o alvo sai do heap: uma chegada que cruza o próprio caminho é
+        descartada e a busca segue para chegadas ao alvo em outros tempos.
+        Nunca devolve um caminho que cruza a si mesmo, mas é incompleta: um
+        caminho válido que só existiria por estados já fechados por um
+        inválido não é achado. (None, infinity) quer dizer "não achou", não
+        "não existe"; A_NEW_Star só chama depois de search() falhar.
+        max_expansions: desiste (como se não houvesse caminho) após tantos nós.
+        Retorna: (caminho_lista, custo) ou (None, infinity), como search().
+        """
+        cols, rows, n = self.cols, self.rows, self.n_cells
+        s = start[0] * cols + start[1]
+        t = end[0] * cols + end[1]
+        horizon = self._horizon
+        fgen = self._free_generation
+        free_at, stamp = self._free_at, self._free_stamp
+        neighbors = self.neighbors
+        row_of, col_of = self.row_of, self.col_of
+        wrap = self.wrap
+        tr, tc = row_of[t], col_of[t]
+        push, pop = heapq.heappush, heapq.heappop
+
+        # estado = (min(tempo, horizonte) * n + célula) * 5 + direção de entrada
+        # (4 = nenhuma, no início): com ela o estado já proíbe a volta de 180°
+        size = (horizon + 1) * n * 5
+        if size > self._timed_size:
+            # o corpo cresce uma parte por food: dobra em vez de realocar sempre
+            self._grow_timed(max(size, min(2 * self._timed_size, (n + 1) * n * 5)))
+        self._generation += 1
+        gen = self._generation
+        best_g, parent = self._timed_g, self._timed_parent
+        seen, closed = self._timed_seen, self._timed_closed
+
+        start_key = (min(t0, horizon) * n + s) * 5 + 4
+        best_g[start_key] = 0
+        parent[start_key] = -1
+        seen[start_key] = gen
+        open_list = [(self.heuristic(s, t), 0, start_key)]
+        expansions = 0
+
+        while open_list:
+            _, neg_g, key = pop(open_list)
+            if closed[key] == gen:
+                continue  # entrada velha (lazy deletion)
+            closed[key] = gen
+            expansions += 1
+            if max_expansions is not None and expansions > max_expansions:
+                break
+
+            cur = key // 5 % n
+            if cur == t:
+                cells = []
+                while key != -1:
+                    cells.append(key // 5 % n)
+                    key = parent[key]
+                cells.reverse()
+                if self._crosses_own_path(cells, horizon):
+                    continue
+                self.expansions = expansions
+                self.total_expansions += expansions
+                return [divmod(cell, cols) for cell in cells], len(cells)
+
+            ng = 1 - neg_g
+            step = t0 + ng
+            slot = (step if step < horizon else horizon) * n
+            base = 4 * cur
+            # up/down e left/right são pares (k ^ 1 é a direção oposta); com
+            # corpo de até 2 partes a célula anterior já está livre de novo
+            back = key % 5 ^ 1 if horizon > 2 else -1
+            for k in range(4):
+                nb = neighbors[base + k]
+                if nb < 0 or k == back:
+                    continue
+                if stamp[nb] == fgen and step < free_at[nb]:
+                    continue
+                nkey = (slot + nb) * 5 + k
+                if closed[nkey] == gen:
+                    continue
+                if seen[nkey] == gen and best_g[nkey] <= ng:
+                    continue
+                seen[nkey] = gen
+                best_g[nkey] = ng
+                parent[nkey] = key
+
+                dr = abs(row_of[nb] - tr)
+                dc = abs(col_of[nb] - tc)
+                if wrap:
+                    if dr > rows - dr:
+                        dr = rows - dr
+                    if dc > cols - dc:
+                        dc = cols - dc
+                push(open_list, (ng + dr + dc, -ng, nkey))
+
+        self.expansions = expansions
+        self.total_expansions += expansions
+        return None, float('inf')
+
+    def _grow_timed(self, size):
+        """Realoca os buffers da busca temporal para size estados (stamps zerados)."""
+        self._timed_size = size
+        self._timed_g = array("l", [0]) * size
+        self._timed_parent = array("l", [-1]) * size
+        self._timed_seen = array("l", [0]) * size
+        self._timed_closed = array("l", [0]) * size
+
+    @staticmethod
+    def _crosses_own_path(cells, length):
+        """
+        O próprio caminho também vira corpo: uma célula entrada há menos de
+        'length' passos ainda está ocupada. True se cells (células planas, em
+        ordem) volta a alguma célula dentro dessa janela.
+        """
+        entered = {}
+        for step, cell in enumerate(cells):
+            if step - entered.get(cell, -length) < length:
+                return True
+            entered[cell] = step
+        return False
+
+    # ---------------------- campos de distância ----------------------
+
+    def distance_field(self, source):
+        """
+        BFS a partir de source=(row, col) com os obstáculos atuais.
+        Retorna (dist, parent): arrays novos do tamanho do grid, com
+        dist = -1 nas células inalcançáveis. Uma BFS serve para todos os alvos.
+        """
+        n = self.n_cells
+        dist = array("l", [-1]) * n
+        parent = array("l", [-1]) * n
+        blocked, bgen = self._blocked, self._obstacle_generation
+        neighbors = self.neighbors
+
+        s = source[0] * self.cols + source[1]
+        dist[s] = 0
+        queue = deque([s])
+        pop, push = queue.popleft, queue.append
+        visited = 0
+        while queue:
+            cur = pop()
+            visited += 1
+            nd = dist[cur] + 1
+            base = 4 * cur
+            for k in range(4):
+                nb = neighbors[base + k]
+                if nb < 0 or dist[nb] >= 0 or blocked[nb] == bgen:
+                    continue
+                dist[nb] = nd
+                parent[nb] = cur
+                push(nb)
+        self.expansions = visited
+        self.total_expansions += visited
+        return dist, parent
+
+    def path_from_field(self, parent, target):
+        """Caminho (lista de (row, col)) da origem de um distance_field até target."""
+        cols = self.cols
+        cell = target[0] * cols + target[1]
+        path = []
+        while cell != -1:
+            path.append(divmod(cell, cols))
+            cell = parent[cell]
+        path.reverse()
+        return path
+
+    def _build_path(self, cell):
+        cols = self.cols
+        parent = self.parent
+        path = []
+        while cell != -1:
+            path.append(divmod(cell, cols))
+            cell = parent[cell]
+        path.reverse()
+        return path, len(path)
@@ -0,0 +1,112 @@
+class SurvivalCheck:
+    """
+    Flood fill em bitset: o grid inteiro é um int do Python (bit r * cols + c),
+    e um passo da BFS é um punhado de shifts/ANDs sobre todas as células de
+    uma vez. Em 100x100 cada passo custa alguns µs, independente do tamanho
+    da fronteira.
+
+    Usado pelo A_Star antes de se comprometer com um caminho: simula o corpo
+    depois de seguir o caminho até a food e confere se a cabeça ainda alcança
+    a cauda (que vai liberando espaço), o critério clássico de sobrevivência.
+    """
+
+    def __init__(self, rows, cols, wrap=False):
+        self.rows = rows
+        self.cols = cols
+        self.wrap = wrap
+        n = rows * cols
+        self.n_cells = n
+
+        self.full = (1 << n) - 1
+        first_col = 0
+        for r in range(rows):
+            first_col |= 1 << (r * cols)
+        self.first_col = first_col
+        self.last_col = first_col << (cols - 1)
+        self.first_row = (1 << cols) - 1
+        self.last_row = self.first_row << (n - cols)
+
+    # ---------------------- máscaras ----------------------
+
+    def mask_of(self, cells):
+        """Bitset das células (row, col): liga os bits em bytes e converte uma vez."""
+        cols = self.cols
+        bits = bytearray((self.n_cells + 7) >> 3)
+        for r, c in cells:
+            cell = r * cols + c
+            bits[cell >> 3] |= 1 << (cell & 7)
+        return int.from_bytes(bits, "little")
+
+    def expand(self, mask):
+        """Células a 1 passo (4 vizinhos) de alguma célula de mask."""
+        cols = self.cols
+        grown = (
+            ((mask >> 1) & ~self.last_col)                 # esquerda
+            | ((mask << 1) & ~self.first_col & self.full)  # direita
+            | (mask >> cols)                               # cima
+            | ((mask << cols) & self.full)                 # baixo
+        )
+        if self.wrap:
+            n = self.n_cells
+            grown |= (
+                ((mask & self.first_col) << (cols - 1))
+                | ((mask & self.last_col) >> (cols - 1))
+                | ((mask & self.first_row) << (n - cols))
+                | ((mask & self.last_row) >> (n - cols))
+            )
+        return grown
+
+    def flood(self, start, free, target=None):
+        """
+        Células de 'free' alcançáveis a partir da célula start (índice plano).
+        Com target (índice), para assim que ele é alcançado.
+        """
+        reach = 1 << start
+        frontier = reach
+        target_bit = 0 if target is None else 1 << target
+        while frontier:
+            frontier = self.expand(frontier) & free & ~reach
+            reach |= frontier
+            if reach & target_bit:
+                break
+        return reach
+
+    # ---------------------- checagens ----------------------
+
+    def tail_reachable(self, body):
+        """A cabeça (body[0]) alcança a cauda (body[-1]) sem cruzar o resto do corpo?"""
+        if len(body) < 3:
+            return True
+        cols = self.cols
+        head_r, head_c = body[0]
+        tail_r, tail_c = body[-1]
+        head = head_r * cols + head_c
+        tail = tail_r * cols + tail_c
+        free = self.full & ~self.mask_of(body)
+        free |= 1 << tail
+        return bool(self.flood(head, free, tail) >> tail & 1)
+
+    def region_size(self, body):
+        """Quantas células livres a cabeça (body[0]) alcança com esse corpo."""
+        cols = self.cols
+        head_r, head_c = body[0]
+        free = self.full & ~self.mask_of(body)
+        return (self.flood(head_r * cols + head_c, free) & free).bit_count()
+
+    @staticmethod
+    def body_after(path, snake_body, food_positions):
+        """
+        Corpo depois de seguir path (path[0] = cabeça atual): a cabeça anda
+        pelo caminho e cada food comida no caminho segura a cauda um tick.
+        """
+        foods = set(food_positions)
+        eaten = sum(1 for cell in path[1:] if cell in foods)
+        length = len(snake_body) + max(eaten - 1, 0)
+        moved = path[:0:-1]
+        if len(moved) >= length:
+            return moved[:length]
+        return moved + list(snake_body)[:length - len(moved)]
+
+    def path_is_safe(self, path, snake_body, food_positions):
+        """Seguir path até a food ainda deixa a cauda alcançável?"""
+        return self.tail_reachable(self.body_after(path, snake_body, food_positions))
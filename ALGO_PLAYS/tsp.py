@@ -0,0 +1,53 @@
+INF = float('inf')
+
+
+def held_karp_order(dist):
+    """
+    Melhor ordem para visitar todos os alvos partindo do nó 0 (sem voltar).
+
+    dist: matriz (k+1) x (k+1); dist[i][j] é o custo de i até j, INF se
+          não há caminho. O nó 0 é a origem (cabeça), 1..k são as foods.
+    Retorna: (custo, ordem) com a ordem como lista de índices 1..k, ou
+             (INF, []) se nenhuma ordem completa é possível.
+
+    DP de Held-Karp: O(2^k * k^2) em vez de O(k!) permutações.
+    """
+    k = len(dist) - 1
+    if k <= 0:
+        return 0, []
+
+    full = (1 << k) - 1
+    # best[mask][j]: menor custo saindo de 0, visitando 'mask', terminando em j
+    best = [[INF] * k for _ in range(full + 1)]
+    prev = [[-1] * k for _ in range(full + 1)]
+    for j in range(k):
+        best[1 << j][j] = dist[0][j + 1]
+
+    for mask in range(1, full + 1):
+        row = best[mask]
+        for j in range(k):
+            cost = row[j]
+            if cost == INF or not (mask >> j) & 1:
+                continue
+            dj = dist[j + 1]
+            for nxt in range(k):
+                if (mask >> nxt) & 1:
+                    continue
+                new_cost = cost + dj[nxt + 1]
+                new_mask = mask | (1 << nxt)
+                if new_cost < best[new_mask][nxt]:
+                    best[new_mask][nxt] = new_cost
+                    prev[new_mask][nxt] = j
+
+    last = min(range(k), key=lambda j: best[full][j])
+    total = best[full][last]
+    if total == INF:
+        return INF, []
+
+    order = []
+    mask = full
+    while last != -1:
+        order.append(last + 1)
+        last, mask = prev[mask][last], mask & ~(1 << last)
+    order.reverse()
+    return total, order
@@ -0,0 +1,215 @@
+import numpy as np
+
+# códigos de ação/orientação (mesma ordem de SnakeEngine.DIRECTIONS)
+UP, DOWN, LEFT, RIGHT = 0, 1, 2, 3
+DIRECTIONS = ("up", "down", "left", "right")
+
+# deslocamento (linha, coluna) de cada orientação
+_DR = np.array([-1, 1, 0, 0], dtype=np.int64)
+_DC = np.array([0, 0, -1, 1], dtype=np.int64)
+
+# condição do jogo (TRUNCATED: encerrado de fora, ex. limite de passos)
+ALIVE, WIN, LOSS, TRUNCATED = 0, 1, 2, 3
+
+
+class BatchSnakeEnv:
+    """
+    N jogos de snake avançando juntos com NumPy (sem pygame).
+
+    Mesmas regras do SnakeEngine / Game.run:
+      - movimento com wrap nas bordas (snake.move_snake)
+      - morte quando a cabeça entra em body[2:] (check_colision)
+      - ao comer, cresce 1 e a food vai para uma célula livre aleatória
+      - vitória quando o corpo ocupa o grid inteiro (check_win)
+
+    Estado (células como índice plano r * cols + c):
+      body       (N, rows*cols) ring buffer; body[n, head_ptr[n]] é a cabeça
+      head_ptr   (N,) posição da cabeça no ring buffer
+      length     (N,) tamanho atual do corpo
+      pending    (N,) crescimento pendente (a cauda não anda no próximo passo)
+      occupancy  (N, rows*cols) quantas partes do corpo estão em cada célula
+      foods      (N, n_foods) célula de cada food, -1 se não há espaço
+    """
+
+    def __init__(self, n_games, rows, cols, n_foods=3, seed=None, auto_reset=False):
+        self.n_games = n_games
+        self.rows = rows
+        self.cols = cols
+        self.n_cells = rows * cols
+        self.n_foods = n_foods
+        self.auto_reset = auto_reset
+        self.rng = np.random.default_rng(seed)
+
+        n, cap = n_games, self.n_cells
+        self.body = np.zeros((n, cap), dtype=np.int32)
+        self.head_ptr = np.zeros(n, dtype=np.int64)
+        self.length = np.zeros(n, dtype=np.int64)
+        self.pending = np.zeros(n, dtype=np.int64)
+        self.head = np.zeros(n, dtype=np.int64)
+        self.orientation = np.zeros(n, dtype=np.int8)
+        self.occupancy = np.zeros((n, cap), dtype=np.uint8)
+        self.foods = np.full((n, n_foods), -1, dtype=np.int64)
+        self.condition = np.zeros(n, dtype=np.int8)
+        self.steps = np.zeros(n, dtype=np.int64)
+        self.score = np.zeros(n, dtype=np.int64)
+
+        self._all = np.arange(n)
+        self.reset()
+
+    # ---------------------- ciclo de vida ----------------------
+
+    def reset(self, mask=None):
+        """Reinicia todos os jogos, ou só os marcados em mask (array bool)."""
+        idx = self._all if mask is None else np.flatnonzero(mask)
+        if idx.size == 0:
+            return
+
+        center_row = self.rows // 2
+        center_col = self.cols // 2
+        start = [
+            center_row * self.cols + (center_col - k) % self.cols
+            for k in (2, 1, 0)  # da cauda até a cabeça
+        ]
+
+        self.body[idx] = 0
+        self.body[idx, :3] = start
+        self.head_ptr[idx] = 2
+        self.length[idx] = 3
+        self.pending[idx] = 0
+        self.head[idx] = start[-1]
+        self.orientation[idx] = RIGHT
+        self.occupancy[idx] = 0
+        self.occupancy[np.ix_(idx, start)] = 1
+        self.condition[idx] = ALIVE
+        self.steps[idx] = 0
+        self.score[idx] = 0
+
+        self.foods[idx] = -1
+        for slot in range(self.n_foods):
+            self._place_foods(idx, slot)
+
+    @property
+    def done(self):
+        return self.condition != ALIVE
+
+    # ---------------------- passo vetorizado ----------------------
+
+    def step(self, actions=None):
+        """
+        Avança todos os jogos vivos em um tick.
+
+        actions: array (N,) com 0..3 (up, down, left, right) ou -1 para manter
+                 a orientação; viradas de 180° são ignoradas como no Game.
+        Retorna (ate, done): arrays bool (N,) deste passo.
+        """
+        ate = np.zeros(self.n_games, dtype=bool)
+        idx = np.flatnonzero(self.condition == ALIVE)
+        if idx.size == 0:
+            return ate, self.done.copy()
+
+        # 1. orientação (sem virar 180°: up^1 = down, left^1 = right)
+        if actions is not None:
+            act = np.asarray(actions, dtype=np.int64)[idx]
+            turn = (act >= 0) & (act != (self.orientation[idx] ^ 1))
+            self.orientation[idx[turn]] = act[turn]
+
+        # 2. nova cabeça com wrap
+        ori = self.orientation[idx]
+        old_head = self.head[idx]
+        new_r = (old_head // self.cols + _DR[ori]) % self.rows
+        new_c = (old_head % self.cols + _DC[ori]) % self.cols
+        new_head = new_r * self.cols + new_c
+
+        # 3. cauda: anda, a não ser que exista crescimento pendente
+        growing = self.pending[idx] > 0
+        moving = idx[~growing]
+        tail_slot = (self.head_ptr[moving] - self.length[moving] + 1) % self.n_cells
+        tail_cell = self.body[moving, tail_slot]
+        self.occupancy[moving, tail_cell] -= 1
+        grown = idx[growing]
+        self.pending[grown] -= 1
+        self.length[grown] += 1
+
+        # 4. colisão: cabeça em body[2:] (body[1] é a cabeça anterior)
+        hits = self.occupancy[idx, new_head].astype(np.int64) - (new_head == old_head)
+        lost = hits > 0
+
+        # 5. empurra a nova cabeça
+        ptr = (self.head_ptr[idx] + 1) % self.n_cells
+        self.head_ptr[idx] = ptr
+        self.body[idx, ptr] = new_head
+        self.occupancy[idx, new_head] += 1
+        self.head[idx] = new_head
+        self.steps[idx] += 1
+        self.condition[idx[lost]] = LOSS
+
+        # 6. comida
+        match = (self.foods[idx] == new_head[:, None]) & ~lost[:, None]
+        eat = match.any(axis=1)
+        if eat.any():
+            eaters = idx[eat]
+            slots = match[eat].argmax(axis=1)
+            ate[eaters] = True
+            self.pending[eaters] += 1
+            self.score[eaters] += 1
+            for slot in np.unique(slots):
+                self._place_foods(eaters[slots == slot], slot)
+
+        # 7. vitória: corpo (contando o crescimento pendente) ocupa o grid
+        won = idx[~lost & (self.length[idx] + self.pending[idx] == self.n_cells)]
+        self.condition[won] = WIN
+
+        done = self.done.copy()
+        if self.auto_reset and done.any():
+            self.reset(done)
+        return ate, done
+
+    def truncate(self, mask):
+        """Encerra os jogos vivos marcados em mask sem vitória nem derrota."""
+        self.condition[np.asarray(mask, dtype=bool) & (self.condition == ALIVE)] = TRUNCATED
+
+    # ---------------------- comida ----------------------
+
+    def _place_foods(self, games, slot, tries=8):
+        """Sorteia uma célula livre (sem corpo e sem outra food) para foods[games, slot]."""
+        if games.size == 0:
+            return
+        self.foods[games, slot] = -1
+        others = self.foods[games]
+
+        # rejeição: barato enquanto o tabuleiro tem espaço
+        cand = self.rng.integers(0, self.n_cells, size=(games.size, tries))
+        ok = self.occupancy[games[:, None], cand] == 0
+        ok &= ~(cand[:, :, None] == others[:, None, :]).any(axis=2)
+        found = ok.any(axis=1)
+        first = ok.argmax(axis=1)
+        self.foods[games[found], slot] = cand[found, first[found]]
+
+        # fallback exato para os jogos quase cheios
+        rest = games[~found]
+        if rest.size == 0:
+            return
+        free = self.occupancy[rest] == 0
+        rows = np.repeat(np.arange(rest.size), self.n_foods)
+        cols = self.foods[rest].ravel()
+        keep = cols >= 0
+        free[rows[keep], cols[keep]] = False
+        keys = self.rng.random(free.shape)
+        keys[~free] = -1.0
+        pick = keys.argmax(axis=1)
+        self.foods[rest, slot] = np.where(free.any(axis=1), pick, -1)
+
+    # ---------------------- utilidades ----------------------
+
+    def body_cells(self, game):
+        """Corpo do jogo `game` como lista (row, col) da cabeça até a cauda."""
+        ptr = self.head_ptr[game]
+        slots = (ptr - np.arange(self.length[game])) % self.n_cells
+        return [divmod(int(cell), self.cols) for cell in self.body[game, slots]]
+
+    def food_cells(self, game):
+        return [divmod(int(cell), self.cols) for cell in self.foods[game] if cell >= 0]
+
+    def grids(self):
+        """Visão (N, rows, cols) da ocupação do corpo, sem cópia."""
+        return self.occupancy.reshape(self.n_games, self.rows, self.cols)
@@ -0,0 +1,106 @@
+"""
+Episódios headless em lote (sem pygame), um resultado JSON por linha.
+
+    python batch_run.py A_STAR --episodes 100                   # 30x40, 3 foods, seeds 0..99
+    python batch_run.py HAMILTON --rows 20 --cols 20 -n 8 -w 4  # 4 processos
+    python batch_run.py A_NEW_STAR --seed 1000 -o runs.jsonl    # seeds 1000..
+
+Cada linha traz modo, seed, tamanho do tabuleiro, score, steps, resultado
+("win", "loss" ou "starved" depois de max_hunger ticks sem comer) e o
+tempo de parede do episódio. As linhas saem na ordem em que os episódios
+terminam, então dá para acompanhar (ou cortar) uma varredura longa.
+"""
+import argparse
+import json
+import multiprocessing
+import sys
+import time
+
+from engine import SnakeEngine
+from strategies import AI_MODES, make_policy, needs_info
+
+
+def run_episode(mode, rows, cols, n_foods, seed, max_steps=None, max_hunger=None):
+    """
+    Joga um episódio do modo de IA com a seed dada e devolve o resultado.
+    max_hunger (padrão rows * cols) encerra IAs presas em loop sem comer.
+    """
+    if max_hunger is None:
+        max_hunger = rows * cols
+
+    start = time.perf_counter()
+    engine = SnakeEngine(rows, cols, n_foods=n_foods, seed=seed, with_info=needs_info(mode))
+    policy = make_policy(mode, rows, cols)
+
+    hunger = 0
+    outcome = None
+    while not engine.done:
+        engine.step(policy(engine))
+        hunger = 0 if engine.last_eaten is not None else hunger + 1
+        if hunger >= max_hunger:
+            outcome = "starved"
+            break
+        if max_steps is not None and engine.steps >= max_steps:
+            outcome = "max_steps"
+            break
+
+    return {
+        "mode": mode,
+        "seed": seed,
+        "rows": rows,
+        "cols": cols,
+        "foods": n_foods,
+        "score": engine.score,
+        "steps": engine.steps,
+        "outcome": outcome or engine.condition,
+        "wall_time": round(time.perf_counter() - start, 6),
+    }
+
+
+def _run_job(job):
+    return run_episode(*job)
+
+
+def iter_results(mode, rows, cols, n_foods, seeds, workers=1, max_steps=None, max_hunger=None):
+    """Resultados dos episódios (um por seed), na ordem em que terminam."""
+    jobs = [(mode, rows, cols, n_foods, seed, max_steps, max_hunger) for seed in seeds]
+    if workers <= 1:
+        for job in jobs:
+            yield _run_job(job)
+        return
+
+    with multiprocessing.Pool(workers) as pool:
+        yield from pool.imap_unordered(_run_job, jobs)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Episódios headless em lote (saída JSON lines).")
+    parser.add_argument("mode", choices=AI_MODES)
+    parser.add_argument("-n", "--episodes", type=int, default=10)
+    parser.add_argument("--rows", type=int, default=30)
+    parser.add_argument("--cols", type=int, default=40)
+    parser.add_argument("--foods", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0, help="seed do primeiro episódio (as seguintes somam 1)")
+    parser.add_argument("-w", "--workers", type=int, default=1,
+                        help="processos em paralelo (0 = um por CPU)")
+    parser.add_argument("--max-steps", type=int, help="encerra o episódio depois de tantos ticks")
+    parser.add_argument("--max-hunger", type=int,
+                        help="ticks sem comer até desistir (padrão: rows * cols)")
+    parser.add_argument("-o", "--output", help="arquivo JSON lines de saída (padrão: stdout)")
+    args = parser.parse_args(argv)
+
+    workers = args.workers or multiprocessing.cpu_count()
+    seeds = range(args.seed, args.seed + args.episodes)
+    out = open(args.output, "w") if args.output else sys.stdout
+    try:
+        for result in iter_results(args.mode, args.rows, args.cols, args.foods, seeds,
+                                   workers, args.max_steps, args.max_hunger):
+            out.write(json.dumps(result) + "\n")
+            out.flush()
+    finally:
+        if out is not sys.stdout:
+            out.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,291 @@
+"""
+Benchmarks do projeto (runner standalone, sem pygame na tela).
+
+    python benchmarks.py                      # tudo, resultados JSON no stdout
+    python benchmarks.py --quick -o out.json  # menos repetições, salva em arquivo
+    python benchmarks.py --only a_star        # só os casos cujo nome contém 'a_star'
+
+Cada resultado traz o tempo por chamada em microssegundos (min, mediana e
+média entre as repetições) e os parâmetros do caso, para comparar versões.
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import time
+import timeit
+
+# Game.draw roda sem janela de verdade
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+
+BOARDS = ((15, 20), (30, 40), (60, 80))
+LENGTH_FRACTIONS = (0.1, 0.3, 0.5)
+FOOD_COUNTS = (1, 2, 3, 4, 5, 6)
+SNAKE_LENGTHS = (3, 30, 300, 3000)
+OCCUPANCIES = (0.5, 0.9, 0.99)
+
+
+# ---------------------- cenários determinísticos ----------------------
+
+def comb_body(rows, cols, length):
+    """
+    Corpo em "pente" (cabeça -> cauda): linhas pares inteiras ligadas por uma
+    célula na ponta das linhas ímpares. Os corredores das linhas ímpares
+    obrigam o A* a dar voltas, como um corpo enrolado de verdade.
+    """
+    cells = []
+    row = 0
+    while len(cells) < length and row < rows:
+        span = range(cols) if (row // 2) % 2 == 0 else range(cols - 1, -1, -1)
+        for c in span:
+            cells.append((row, c))
+        if row + 1 < rows:
+            cells.append((row + 1, cells[-1][1]))
+        row += 2
+    cells = cells[:length]
+    cells.reverse()
+    return cells
+
+
+def free_targets(rows, cols, body, count, seed):
+    """Células livres sorteadas (fora do corpo) para servirem de alvo/food."""
+    rng = random.Random(seed)
+    occupied = set(body)
+    free = [(r, c) for r in range(rows) for c in range(cols) if (r, c) not in occupied]
+    return rng.sample(free, min(count, len(free)))
+
+
+# ---------------------- medição ----------------------
+
+def measure(fn, number, repeat):
+    """Tempo por chamada (µs) de fn, com timeit: min/mediana/média das repetições."""
+    times = timeit.repeat(fn, number=number, repeat=repeat, timer=time.perf_counter)
+    per_call = [t / number * 1e6 for t in times]
+    return {
+        "unit": "us",
+        "min": min(per_call),
+        "median": statistics.median(per_call),
+        "mean": statistics.fmean(per_call),
+        "number": number,
+        "repeat": repeat,
+    }
+
+
+def result(name, params, stats, **extra):
+    return {"name": name, "params": params, **stats, **extra}
+
+
+# ---------------------- casos ----------------------
+
+def bench_a_star(scale):
+    """A_Star.a_star_search entre a cabeça e alvos fixos, por tabuleiro e tamanho."""
+    from ALGO_PLAYS.A_STAR import A_Star
+
+    for rows, cols in BOARDS:
+        ai = A_Star(rows, cols)
+        for fraction in LENGTH_FRACTIONS:
+            length = max(3, int(rows * cols * fraction))
+            body = comb_body(rows, cols, length)
+            obstacles = body[1:]
+            targets = free_targets(rows, cols, body, 10, seed=rows * cols + length)
+
+            def run():
+                for target in targets:
+                    ai.a_star_search(body[0], target, obstacles)
+
+            stats = measure(run, number=max(1, scale), repeat=5)
+            stats = {k: (v / len(targets) if k in ("min", "median", "mean") else v) for k, v in stats.items()}
+            yield result("a_star_search", {"rows": rows, "cols": cols, "length": length}, stats,
+                         expansions=ai.grid_search.expansions)
+
+
+def bench_a_new_star(scale):
+    """A_NEW_Star (wrap + busca temporal) com uma food por plano."""
+    from ALGO_PLAYS.A_NEW_STAR import A_NEW_Star
+
+    for rows, cols in BOARDS:
+        ai = A_NEW_Star(rows, cols)
+        for fraction in LENGTH_FRACTIONS:
+            length = max(3, int(rows * cols * fraction))
+            body = comb_body(rows, cols, length)
+            targets = free_targets(rows, cols, body, 10, seed=rows * cols + length)
+
+            def run():
+                for target in targets:
+                    ai.find_best_path_tsp(body[0], [target], body)
+
+            stats = measure(run, number=max(1, scale), repeat=5)
+            stats = {k: (v / len(targets) if k in ("min", "median", "mean") else v) for k, v in stats.items()}
+            yield result("a_new_star_plan", {"rows": rows, "cols": cols, "length": length}, stats)
+
+
+def bench_tsp(scale):
+    """find_best_path_tsp em 30x40 variando o número de foods e o modo do TSP."""
+    from ALGO_PLAYS.A_STAR import A_Star
+
+    rows, cols = 30, 40
+    body = comb_body(rows, cols, 120)
+    for mode in ("permutations", "held_karp"):
+        ai = A_Star(rows, cols, tsp_mode=mode)
+        for n_foods in FOOD_COUNTS:
+            foods = free_targets(rows, cols, body, n_foods, seed=n_foods)
+            number = max(1, scale // n_foods) if mode == "permutations" else max(1, scale)
+            stats = measure(lambda: ai.find_best_path_tsp(body[0], foods, body), number=number, repeat=3)
+            yield result("find_best_path_tsp", {"rows": rows, "cols": cols, "foods": n_foods, "mode": mode}, stats)
+
+
+def bench_move(scale):
+    """snake.move_snake + check_colision por tick, em função do tamanho."""
+    from engine import check_colision
+    from food import food
+    from snake import snake
+
+    for length in SNAKE_LENGTHS:
+        # uma linha larga o bastante para o corpo andar reto sem se bater
+        rows, cols = 5, length + 10
+        player_snake = snake(rows, cols, 1)
+        for _ in range(length - 3):
+            player_snake.grow_snake()
+            player_snake.move_snake()
+        foods = [food(rows, cols, 1) for _ in range(3)]
+        for f in foods:
+            f.POS = (0, 0)
+
+        def tick():
+            player_snake.move_snake()
+            check_colision(player_snake, foods)
+
+        stats = measure(tick, number=2000 * max(1, scale), repeat=5)
+        yield result("move_and_collide", {"length": len(player_snake.body)}, stats)
+
+
+def bench_relocate(scale):
+    """food.relocate_food com o tabuleiro quase cheio: FreeCellIndex e conjunto."""
+    from food import food
+    from free_cells import FreeCellIndex
+
+    rows, cols = 30, 40
+    n = rows * cols
+    for occupancy in OCCUPANCIES:
+        rng = random.Random(0)
+        cells = list(range(n))
+        rng.shuffle(cells)
+        taken = cells[:int(n * occupancy)]
+
+        index = FreeCellIndex(rows, cols)
+        for cell in taken:
+            index.occupy(cell)
+        f = food(rows, cols, 1)
+
+        def relocate_index():
+            f.relocate_food(index, rng)
+            index.release(f.POS[0] * cols + f.POS[1])  # mantém a ocupação
+
+        stats = measure(relocate_index, number=500 * max(1, scale), repeat=5)
+        yield result("relocate_food", {"rows": rows, "cols": cols, "occupancy": occupancy, "index": "FreeCellIndex"}, stats)
+
+        occupied = {divmod(cell, cols) for cell in taken}
+        stats = measure(lambda: f.relocate_food(occupied, rng), number=max(1, scale), repeat=5)
+        yield result("relocate_food", {"rows": rows, "cols": cols, "occupancy": occupancy, "index": "set"}, stats)
+
+
+def bench_draw(scale):
+    """Game.draw com o driver dummy do SDL: frame incremental e redesenho completo."""
+    import pygame
+    from main import Game
+
+    pygame.init()
+    rows, cols, cell_size = 30, 40, 20
+    screen = pygame.display.set_mode((cols * cell_size, rows * cell_size))
+    games = [Game(screen, rows, cols, cell_size, "A_STAR")]
+    games[0].draw()
+
+    def incremental():
+        game = games[0]
+        game.engine.step(game._handle_ai())
+        if game.engine.done:
+            # fim de jogo: recomeça com um Game novo (o renderer guarda a snake)
+            game = games[0] = Game(screen, rows, cols, cell_size, "A_STAR")
+        game.draw()
+
+    def full():
+        games[0].renderer.invalidate()
+        games[0].draw()
+
+    params = {"rows": rows, "cols": cols, "cell_size": cell_size}
+    yield result("game_draw", {**params, "frame": "step+incremental"}, measure(incremental, number=50 * max(1, scale), repeat=3))
+    yield result("game_draw", {**params, "frame": "full"}, measure(full, number=10 * max(1, scale), repeat=3))
+    pygame.quit()
+
+
+BENCHMARKS = {
+    "a_star_search": bench_a_star,
+    "a_new_star_plan": bench_a_new_star,
+    "find_best_path_tsp": bench_tsp,
+    "move_and_collide": bench_move,
+    "relocate_food": bench_relocate,
+    "game_draw": bench_draw,
+}
+
+
+# ---------------------- runner ----------------------
+
+def environment():
+    """Metadados para comparar resultados entre versões e máquinas."""
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True, text=True, cwd=os.path.dirname(os.path.abspath(__file__)),
+        ).stdout.strip() or None
+    except OSError:
+        commit = None
+
+    versions = {}
+    for module in ("numpy", "pygame", "neat"):
+        try:
+            versions[module] = getattr(__import__(module), "__version__", None)
+        except ImportError:
+            versions[module] = None
+
+    return {
+        "commit": commit,
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "versions": versions,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmarks do snake (saída JSON).")
+    parser.add_argument("--only", action="append", default=[],
+                        help="roda só os benchmarks cujo nome contém este texto (pode repetir)")
+    parser.add_argument("--quick", action="store_true", help="menos repetições (checagem rápida)")
+    parser.add_argument("-o", "--output", help="arquivo JSON de saída (padrão: stdout)")
+    args = parser.parse_args(argv)
+
+    scale = 1 if args.quick else 5
+    results = []
+    for name, bench in BENCHMARKS.items():
+        if args.only and not any(key in name for key in args.only):
+            continue
+        for entry in bench(scale):
+            results.append(entry)
+            print(f"{entry['name']:<20} {json.dumps(entry['params'])}: {entry['median']:.1f} us", file=sys.stderr)
+
+    report = {"environment": environment(), "results": results}
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(text + "\n")
+    else:
+        print(text)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,214 @@
+import random
+
+from snake import snake
+from food import food
+from free_cells import FreeCellIndex
+from ALGO_PLAYS.game_info import game_info
+
+# --------------------------- REGRAS DO JOGO ---------------------------
+
+def check_colision(player_snake, foods, info=None):
+    head = player_snake.POS
+
+    # equivale a 'head in player_snake.body[2:]', em O(1)
+    if player_snake.collides_with_self():
+        if info is not None:
+            info.game_condition = "loss"
+        return "self", None
+
+    for f in foods:
+        if f.POS == head:
+            return True, f
+
+    return False, None
+
+
+def check_win(player_snake, rows, cols, info=None):
+    if len(player_snake.body) == rows * cols:
+        if info is not None:
+            info.game_condition = "win"
+        return True
+    return False
+
+
+# --------------------------- ENGINE HEADLESS ---------------------------
+
+class SnakeEngine:
+    """
+    Simulação pura (sem pygame) com as mesmas regras do Game.run.
+
+    Uso:
+        engine = SnakeEngine(rows, cols, seed=0)
+        engine.reset()
+        while not engine.done:
+            engine.step("up")   # ou None para manter a orientação
+    """
+
+    DIRECTIONS = ("up", "down", "left", "right")
+    OPPOSITE = {"up": "down", "down": "up", "left": "right", "right": "left"}
+
+    def __init__(self, rows, cols, n_foods=3, seed=None, cell_size=1, with_info=True):
+        self.rows = rows
+        self.cols = cols
+        self.n_foods = n_foods
+        self.cell_size = cell_size
+        self.with_info = with_info
+        self.seed = seed
+        self.rng = random.Random(seed)
+
+        self.free_cells = None
+        self.player_snake = None
+        self.foods = []
+        self.info = None
+        self.condition = "alive"  # "alive", "win", "loss"
+        self.steps = 0
+        self.score = 0
+        self.last_eaten = None
+        # profiling.TickProfiler opcional (None = sem custo de medição)
+        self.profiler = None
+        # replay.EpisodeRecorder opcional (grava movimentos e foods)
+        self.recorder = None
+
+        self.reset(seed)
+
+    # ---------------------- ciclo de vida ----------------------
+
+    def reset(self, seed=None):
+        """Reinicia o episódio. Se seed for dado, reinicia também o RNG das foods."""
+        if seed is not None:
+            self.seed = seed
+            self.rng.seed(seed)
+
+        # células livres mantidas incrementalmente pela snake e pelas foods
+        self.free_cells = FreeCellIndex(self.rows, self.cols)
+        self.player_snake = snake(self.rows, self.cols, self.cell_size)
+        self.player_snake.attach_free_cells(self.free_cells)
+        self.foods = [food(self.rows, self.cols, self.cell_size) for _ in range(self.n_foods)]
+
+        for f in self.foods:
+            self._place_food(f)
+
+        self.info = game_info(self.rows, self.cols) if self.with_info else None
+        if self.info is not None:
+            self.info.update(self.player_snake, self.foods)
+
+        self.condition = "alive"
+        self.steps = 0
+        self.score = 0
+        self.last_eaten = None
+        if self.recorder is not None:
+            self.recorder.start(self)
+        return self.info
+
+    def snapshot(self):
+        """Estado do episódio em tipos simples (sem o RNG), para restore."""
+        return {
+            "steps": self.steps,
+            "score": self.score,
+            "condition": self.condition,
+            "orientation": self.player_snake.orientation,
+            "body": list(self.player_snake.body),
+            "foods": [f.POS for f in self.foods],
+        }
+
+    def restore(self, state):
+        """Volta ao estado de um snapshot (cria snake, foods e índice novos)."""
+        self.free_cells = FreeCellIndex(self.rows, self.cols)
+        self.player_snake = snake(self.rows, self.cols, self.cell_size)
+        self.player_snake.restore(state["body"], state["orientation"], state["steps"])
+        self.player_snake.attach_free_cells(self.free_cells)
+
+        self.foods = []
+        for pos in state["foods"]:
+            f = food(self.rows, self.cols, self.cell_size)
+            f.POS = pos
+            if pos is not None:
+                self.free_cells.occupy(pos[0] * self.cols + pos[1])
+            self.foods.append(f)
+
+        self.info = game_info(self.rows, self.cols) if self.with_info else None
+        if self.info is not None:
+            self.info.update(self.player_snake, self.foods)
+
+        self.condition = state["condition"]
+        self.steps = state["steps"]
+        self.score = state["score"]
+        self.last_eaten = None
+
+    @property
+    def done(self):
+        return self.condition != "alive"
+
+    # ---------------------- passo da simulação ----------------------
+
+    def apply_direction(self, direction):
+        """Aplica a direção à snake evitando virar 180°; direções inválidas são ignoradas."""
+        if direction not in self.DIRECTIONS:
+            return
+        if self.player_snake.orientation != self.OPPOSITE.get(direction):
+            self.player_snake.orientation = direction
+
+    def step(self, direction=None):
+        """
+        Avança um tick: aplica a direção, move, checa colisão/comida e vitória.
+        Retorna a condição do jogo ("alive", "win" ou "loss").
+        """
+        if self.done:
+            return self.condition
+
+        profiler = self.profiler
+        recorder = self.recorder
+        if recorder is not None:
+            recorder.on_step(self)
+
+        self.apply_direction(direction)
+        if recorder is not None:
+            recorder.on_move(self.player_snake.orientation)
+        self.player_snake.move_snake()
+        self.steps += 1
+        self.last_eaten = None
+        if profiler is not None:
+            profiler.mark("move")
+
+        if self.info is not None:
+            self.info.update(self.player_snake, self.foods)
+            if profiler is not None:
+                profiler.mark("info")
+
+        colision_result, eaten_food = check_colision(
+            self.player_snake,
+            self.foods,
+            self.info
+        )
+        if profiler is not None:
+            profiler.mark("collision")
+
+        if colision_result == "self":
+            self.condition = "loss"
+            return self.condition
+
+        if colision_result is True and eaten_food is not None:
+            self.player_snake.grow_snake()
+            self._place_food(eaten_food)
+            self.score += 1
+            self.last_eaten = eaten_food
+            if profiler is not None:
+                profiler.mark("relocate")
+
+        if check_win(self.player_snake, self.rows, self.cols, self.info):
+            self.condition = "win"
+        if profiler is not None:
+            profiler.mark("win")
+
+        return self.condition
+
+    def _place_food(self, f):
+        """Sorteia a posição de uma food (ponto único, sobrescrito pelo replay)."""
+        f.relocate_food(self.free_cells, self.rng)
+        if self.recorder is not None:
+            self.recorder.on_food(self, f)
+
+    # ---------------------- utilidades ----------------------
+
+    def food_positions(self):
+        return [f.POS for f in self.foods if f.POS is not None]
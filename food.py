@@ -1,6 +1,7 @@
-import pygame
 import random
 
+from free_cells import FreeCellIndex
+
 class food:
     YELLOW = (255, 255, 0)
 
@@ -11,6 +12,8 @@ class food:
         self.POS = None  # (row, col)
 
     def draw_food(self, surface):
+        import pygame
+
         if self.POS is None:
             return
         row, col = self.POS
@@ -22,11 +25,24 @@ class food:
         )
         pygame.draw.rect(surface, self.YELLOW, rect)
 
-    def relocate_food(self, occupied_cells):
+    def relocate_food(self, occupied_cells, rng=None):
         """
         Escolhe uma nova posição para a comida que não esteja em 'occupied_cells'.
-        occupied_cells: conjunto de tuplas (row, col) ocupadas pela snake ou outras foods.
+        occupied_cells: conjunto de tuplas (row, col) ocupadas pela snake ou outras foods,
+            ou um FreeCellIndex (sorteio em O(1); a nova célula passa a ocupada).
+            A célula anterior não é liberada: a food só muda de lugar quando é
+            comida, e aí a cabeça da snake está em cima dela.
+        rng: instância de random.Random (opcional) para posições reproduzíveis.
         """
+        if isinstance(occupied_cells, FreeCellIndex):
+            cell = occupied_cells.sample_cell(rng)
+            if cell is None:
+                self.POS = None
+                return
+            occupied_cells.occupy(cell)
+            self.POS = divmod(cell, self.cols)
+            return
+
         free_cells = [
             (r, c)
             for r in range(self.rows)
@@ -39,4 +55,4 @@ class food:
             self.POS = None
             return
 
-        self.POS = random.choice(free_cells)
\ No newline at end of file
+        self.POS = (rng or random).choice(free_cells)
\ No newline at end of file
@@ -0,0 +1,70 @@
+import random
+from array import array
+
+
+class FreeCellIndex:
+    """
+    Conjunto das células livres do grid com occupy/release/sample em O(1).
+
+    As células ficam em um array-permutação: as 'size' primeiras posições são
+    as livres. Ocupar troca a célula com a última livre (swap-remove) e
+    liberar troca com a primeira ocupada; 'where' guarda a posição de cada
+    célula no array. Células são índices planos r * cols + c.
+    """
+
+    def __init__(self, rows, cols):
+        self.rows = rows
+        self.cols = cols
+        n = rows * cols
+        self._cells = array("l", range(n))
+        self._where = array("l", range(n))
+        self.size = n
+
+    def __len__(self):
+        return self.size
+
+    def __contains__(self, pos):
+        row, col = pos
+        return self.is_free(row * self.cols + col)
+
+    def is_free(self, cell):
+        return self._where[cell] < self.size
+
+    def occupy(self, cell):
+        """Marca a célula como ocupada (não faz nada se já estiver)."""
+        i = self._where[cell]
+        last = self.size - 1
+        if i > last:
+            return
+        other = self._cells[last]
+        self._cells[i] = other
+        self._where[other] = i
+        self._cells[last] = cell
+        self._where[cell] = last
+        self.size = last
+
+    def release(self, cell):
+        """Marca a célula como livre (não faz nada se já estiver)."""
+        i = self._where[cell]
+        first = self.size
+        if i < first:
+            return
+        other = self._cells[first]
+        self._cells[i] = other
+        self._where[other] = i
+        self._cells[first] = cell
+        self._where[cell] = first
+        self.size = first + 1
+
+    def sample_cell(self, rng=None):
+        """Célula livre aleatória (índice plano) ou None se o grid está cheio."""
+        if self.size == 0:
+            return None
+        return self._cells[(rng or random).randrange(self.size)]
+
+    def sample(self, rng=None):
+        """Célula livre aleatória como (row, col) ou None."""
+        cell = self.sample_cell(rng)
+        if cell is None:
+            return None
+        return divmod(cell, self.cols)
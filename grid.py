@@ -1,5 +1,3 @@
-import pygame
-
 class mapa:
     BLACK = (0, 0, 0)
 
@@ -22,6 +20,8 @@ class mapa:
                 self.draw_cell(surface, row, col, color)
 
     def draw_cell(self, surface, row, col, color):
+        import pygame
+
         rect = pygame.Rect(
             col * self.cell_size,
             row * self.cell_size,
@@ -1,160 +1,217 @@
+import argparse
+import os
+import time
+
 import pygame
 import grid
-from snake import snake
-from food import food
+from engine import SnakeEngine
 from menu import Menu
-from ALGO_PLAYS.game_info import game_info
 from ALGO_PLAYS.A_STAR import A_Star
 from ALGO_PLAYS.A_NEW_STAR import A_NEW_Star 
+from ALGO_PLAYS.HAMILTON import Hamiltonian
+from strategies import NEAT_CONFIG
 from user import UserController
+from render import IncrementalRenderer
+from spectator import Spectator
+from profiling import TickProfiler, ai_counters
+from replay import EpisodeRecorder
 
-# --------------------------- FUNÇÕES AUXILIARES ---------------------------
-
-def check_colision(player_snake, foods, info=None):
-    head = player_snake.POS
-
-    if head in player_snake.body[2:]:
-        if info is not None:
-            info.game_condition = "loss"
-        return "self", None
-
-    for f in foods:
-        if f.POS == head:
-            return True, f
-
-    return False, None
+# --------------------------- CLASSE GAME ---------------------------
 
+class ModeUnavailable(RuntimeError):
+    """O modo escolhido não pode rodar agora; a mensagem volta para o menu."""
 
-def check_win(player_snake, rows, cols, info=None):
-    if len(player_snake.body) == rows * cols:
-        if info is not None:
-            info.game_condition = "win"
-        return True
-    return False
 
+class Game:
+    """Renderizador interativo sobre o SnakeEngine (toda regra fica no engine)."""
 
-# --------------------------- CLASSE GAME ---------------------------
+    # ticks de lógica por segundo de cada modo (o render é independente)
+    TICK_RATES = {"JOGAR": 10, "A_STAR": 15, "A_NEW_STAR": 15, "HAMILTON": 15, "NEAT": 15}
+    DEFAULT_TICK_RATE = 15
+    RENDER_FPS = 60
+    MAX_TICKS_PER_FRAME = 5
 
-class Game:
-    def __init__(self, screen, rows, cols, cell_size, mode):
+    def __init__(self, screen, rows, cols, cell_size, mode, turbo=False, profiler=None,
+                 recorder=None, n_foods=3):
         self.screen = screen
         self.rows = rows
         self.cols = cols
         self.cell_size = cell_size
         self.mode = mode
+        self.tick_rate = self.TICK_RATES.get(mode, self.DEFAULT_TICK_RATE)
 
         self.game_map = grid.mapa(rows, cols, cell_size)
-        self.player_snake = snake(rows, cols, cell_size)
-        self.foods = [food(rows, cols, cell_size) for _ in range(3)]
-        
-        occupied = set(self.player_snake.body)
-        for f in self.foods:
-            f.relocate_food(occupied)
-            if f.POS is not None:
-                occupied.add(f.POS)
+        self.engine = SnakeEngine(
+            rows, cols,
+            n_foods=n_foods,
+            cell_size=cell_size,
+            with_info=mode in ("A_STAR", "A_NEW_STAR", "NEAT"),
+        )
+        self.player_snake = self.engine.player_snake
+        self.foods = self.engine.foods
+        self.info = self.engine.info
 
         if self.mode == "A_STAR":
             self.ai = A_Star(rows, cols)
-            self.info = game_info(rows, cols)
         elif self.mode == "A_NEW_STAR":
             self.ai = A_NEW_Star(rows, cols) 
-            self.info = game_info(rows, cols)  
+        elif self.mode == "HAMILTON":
+            self.ai = Hamiltonian(rows, cols)
+        elif self.mode == "NEAT":
+            # neat-python só é carregado neste modo
+            from ALGO_PLAYS.NEAT.NEAT import NEAT_AI
+            self.ai = NEAT_AI(rows, cols, NEAT_CONFIG)
+            if self.ai.net is None:
+                raise ModeUnavailable("NEAT: nenhum genome treinado (rode o treino antes)")
         else:
             self.user_controller = UserController(self.player_snake)
             self.ai = None
-            self.info = None
+
+        # turbo: o máximo de ticks por frame (só faz sentido sem jogador humano)
+        self.turbo = turbo and self.ai is not None
+
+        # redesenha só as células que mudaram a cada frame
+        self.renderer = IncrementalRenderer(
+            screen, self.game_map, self.player_snake, self.foods, cell_size
+        )
+
+        # profiling.TickProfiler opcional: tempos por fase (tecla P = overlay)
+        self.profiler = profiler
+        self.engine.profiler = profiler
+        self.show_overlay = False
+        self._overlay_font = None
+        self._overlay_rect = None
+
+        # replay.EpisodeRecorder opcional: grava o episódio para replay
+        self.recorder = recorder
+        if recorder is not None:
+            recorder.start(self.engine)
 
     def run(self):
+        """
+        Loop de passo fixo: a lógica roda a tick_rate ticks por segundo
+        (acumulador de tempo real) e a tela a RENDER_FPS, independentes.
+        No turbo (tecla T, só modos de IA) roda quantos ticks couberem em um
+        frame e desenha apenas o estado mais recente.
+        """
         clock = pygame.time.Clock()
         running = True
+        tick_time = 1.0 / self.tick_rate
+        frame_budget = 1.0 / self.RENDER_FPS
+        accumulator = 0.0
+        previous = time.perf_counter()
 
         while running:
             for event in pygame.event.get():
                 if event.type == pygame.QUIT:
                     running = False
-
-            # controle de movimento
-            if self.mode == "JOGAR":
-                self.user_controller.handle_input()
-                fps = 10
-            elif self.mode in ("A_STAR", "A_NEW_STAR"):
-                self._handle_ai()
-                fps = 15  
-
-            self.player_snake.move_snake()
-
-            if self.info is not None:
-                self.info.update(self.player_snake, self.foods)
-
-            colision_result, eaten_food = check_colision(
-                self.player_snake,
-                self.foods,
-                self.info
-            )
-
-            if colision_result == "self":
-                running = False
-            elif colision_result is True and eaten_food is not None:
-                self.player_snake.grow_snake()
-                occupied = set(self.player_snake.body)
-                for f in self.foods:
-                    if f is not eaten_food and f.POS is not None:
-                        occupied.add(f.POS)
-                eaten_food.relocate_food(occupied)
-
-            if check_win(self.player_snake, self.rows, self.cols, self.info):
-                running = False
-
-            if self.info is not None and self.info.game_condition in ("win", "loss"):
+                elif event.type == pygame.KEYDOWN and event.key == pygame.K_t and self.ai is not None:
+                    self.turbo = not self.turbo
+                elif event.type == pygame.KEYDOWN and event.key == pygame.K_p and self.profiler is not None:
+                    self.show_overlay = not self.show_overlay
+                    if self._overlay_rect is not None:
+                        self.renderer.repaint(self._overlay_rect)
+                        self._overlay_rect = None
+
+            now = time.perf_counter()
+            accumulator += now - previous
+            previous = now
+
+            if self.turbo:
+                deadline = now + frame_budget
+                self._tick()
+                while not self.engine.done and time.perf_counter() < deadline:
+                    self._tick()
+                accumulator = 0.0
+            else:
+                # limita o atraso acumulado (ex.: janela arrastada) a alguns ticks
+                accumulator = min(accumulator, self.MAX_TICKS_PER_FRAME * tick_time)
+                while accumulator >= tick_time and not self.engine.done:
+                    self._tick()
+                    accumulator -= tick_time
+
+            if self.engine.done:
                 running = False
 
             self.draw()
-            clock.tick(fps)
+            clock.tick(self.RENDER_FPS)
+
+    def _tick(self):
+        """Um passo da lógica: lê o controle e avança o engine."""
+        profiler = self.profiler
+        if profiler is not None:
+            profiler.start_tick()
+
+        direction = None
+        if self.mode == "JOGAR":
+            self.user_controller.handle_input()
+        elif self.ai is not None:
+            direction = self._handle_ai()
+        if profiler is not None:
+            profiler.mark("ai")
+
+        self.engine.step(direction)
+        if profiler is not None:
+            profiler.end_tick(ai_counters(self.ai))
 
     # ---------------------- modos de controle ----------------------
 
     def _apply_direction(self, direction: str):
         """Aplica a direção à snake evitando virar 180°."""
-        if direction == "up" and self.player_snake.orientation != "down":
-            self.player_snake.orientation = "up"
-        elif direction == "down" and self.player_snake.orientation != "up":
-            self.player_snake.orientation = "down"
-        elif direction == "left" and self.player_snake.orientation != "right":
-            self.player_snake.orientation = "left"
-        elif direction == "right" and self.player_snake.orientation != "left":
-            self.player_snake.orientation = "right"
+        self.engine.apply_direction(direction)
 
     def _handle_ai(self):
         if self.ai is None:
-            return
+            return None
+
+        if self.mode == "NEAT":
+            # a rede lê o estado pelo game_info, atualizado pelo engine a cada tick
+            return self.ai.choose_action(self.engine.info)
 
         start = self.player_snake.POS
-        food_positions = [f.POS for f in self.foods if f.POS is not None]
+        food_positions = self.engine.food_positions()
         snake_body = self.player_snake.body
 
-        direction = self.ai.next_direction(start, food_positions, snake_body)
-        if direction is None:
-            return
-
-        self._apply_direction(direction)
+        return self.ai.next_direction(start, food_positions, snake_body)
 
     # ---------------------- desenho ----------------------
 
     def draw(self):
-        self.screen.fill(grid.mapa.BLACK)
-        self.game_map.draw_grid(self.screen)
-        self.player_snake.draw_snake(self.screen)
-        for f in self.foods:
-            f.draw_food(self.screen)
-        pygame.display.flip()
+        if self.profiler is None:
+            self.renderer.draw()
+            return
+
+        start = time.perf_counter()
+        self.renderer.draw()
+        self.profiler.add_sample("draw", time.perf_counter() - start)
+
+        if self.show_overlay:
+            if self._overlay_font is None:
+                self._overlay_font = pygame.font.SysFont(None, 20)
+            rect = self.profiler.draw_overlay(self.screen, self._overlay_font)
+            previous = self._overlay_rect
+            if previous is not None and not rect.contains(previous):
+                # o quadro encolheu: repinta o tabuleiro que ele deixou de cobrir
+                self.renderer.repaint(previous)
+                rect = self.profiler.draw_overlay(self.screen, self._overlay_font)
+            pygame.display.update(rect)
+            self._overlay_rect = rect
 
 # ---------------------------  main ---------------------------
 
-def main():
+def main(argv=None):
+    # episódios sem tela (lotes, varreduras): ver batch_run.py
+    parser = argparse.ArgumentParser(description="Snake com menu interativo.")
+    parser.add_argument("--rows", type=int, default=30)
+    parser.add_argument("--cols", type=int, default=40)
+    parser.add_argument("--cell-size", type=int, default=20, help="pixels por célula")
+    parser.add_argument("--foods", type=int, default=3)
+    args = parser.parse_args(argv)
+
     pygame.init()
 
-    CELL_SIZE = 20
-    ROWS, COLS = 30, 40 
+    CELL_SIZE = args.cell_size
+    ROWS, COLS = args.rows, args.cols
     WIDTH, HEIGHT = COLS * CELL_SIZE, ROWS * CELL_SIZE
 
     screen = pygame.display.set_mode((WIDTH, HEIGHT))
@@ -162,14 +219,44 @@ def main():
 
     font = pygame.font.SysFont(None, 48)
 
-    menu = Menu(screen, font)
-    mode = menu.run()
-    if mode is None:
-        pygame.quit()
-        return
+    # SNAKE_PROFILE=saida.json (ou .csv) liga o profiler e exporta no fim
+    profile_path = os.environ.get("SNAKE_PROFILE")
+    profiler = TickProfiler() if profile_path else None
+    # SNAKE_RECORD=jogo.snkr grava o episódio (ver replay.py)
+    record_path = os.environ.get("SNAKE_RECORD")
+    recorder = EpisodeRecorder() if record_path else None
 
-    game = Game(screen, ROWS, COLS, CELL_SIZE, mode)
-    game.run()
+    menu = Menu(screen, font)
+    game = None
+    while game is None:
+        mode = menu.run()
+        if mode is None:
+            pygame.quit()
+            return
+        if mode == "ESPECTADOR":
+            break
+        try:
+            game = Game(screen, ROWS, COLS, CELL_SIZE, mode, profiler=profiler, recorder=recorder,
+                        n_foods=args.foods)
+        except ModeUnavailable as error:
+            # o aviso aparece no próprio menu, que volta a rodar
+            menu.message = str(error)
+
+    if game is None:
+        # vários jogos de IA em miniatura na mesma janela
+        Spectator(screen, ROWS, COLS, n_foods=args.foods).run()
+    else:
+        game.run()
+
+        if recorder is not None:
+            recorder.finish(game.engine)
+            recorder.save(record_path)
+
+        if profiler is not None:
+            if profile_path.endswith(".csv"):
+                profiler.to_csv(profile_path)
+            else:
+                profiler.to_json(profile_path)
     pygame.quit()
 
 if __name__ == "__main__":
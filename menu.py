@@ -4,8 +4,11 @@ class Menu:
     def __init__(self, screen, font):
         self.screen = screen
         self.font = font
-        self.options = ["JOGAR", "A_STAR", "A_NEW_STAR", "NEAT"]
+        self.options = ["JOGAR", "A_STAR", "A_NEW_STAR", "HAMILTON", "NEAT", "ESPECTADOR"]
         self.selected_index = 0
+        # aviso mostrado embaixo das opções (ex.: modo indisponível)
+        self.message = None
+        self._message_font = None
 
     def run(self):
         """Loop do menu. Retorna o modo escolhido como string ou None se sair."""
@@ -41,4 +44,12 @@ class Menu:
                                          start_y + i * 50))
             self.screen.blit(surf, rect)
 
+        if self.message:
+            if self._message_font is None:
+                self._message_font = pygame.font.SysFont(None, 24)
+            surf = self._message_font.render(self.message, True, (255, 80, 80))
+            rect = surf.get_rect(center=(self.screen.get_width() // 2,
+                                         start_y + len(self.options) * 50))
+            self.screen.blit(surf, rect)
+
         pygame.display.flip()
\ No newline at end of file
@@ -0,0 +1,205 @@
+import csv
+import json
+import time
+from collections import deque
+
+import numpy as np
+
+
+class TickProfiler:
+    """
+    Tempos por fase de cada tick do jogo + contadores da IA, em janela móvel.
+
+    O engine e o Game chamam os hooks só quando há um profiler ligado
+    (atributo profiler != None), então desligado o custo é um teste de None
+    por fase. Fluxo de um tick:
+
+        profiler.start_tick()
+        ... profiler.mark("ai") ... profiler.mark("move") ...
+        profiler.end_tick(ai_counters(ai))
+        profiler.add_sample("draw", segundos)   # o frame entra no último tick
+
+    mark(fase) soma o tempo desde o mark anterior (ou start_tick) na fase.
+    """
+
+    PHASES = ("ai", "move", "info", "collision", "relocate", "win", "draw")
+    COUNTERS = ("expansions", "replans", "repairs", "cache_hits")
+
+    def __init__(self, window=600, clock=time.perf_counter):
+        self.window = window
+        self.clock = clock
+        # um registro por tick: tempos (s) por fase + contadores do tick
+        self.records = deque(maxlen=window)
+        self.ticks = 0
+        self.totals = dict.fromkeys(self.COUNTERS, 0)
+
+        self._current = None
+        self._last = 0.0
+        self._previous_counters = None
+
+    # ---------------------- hooks ----------------------
+
+    def start_tick(self):
+        self._current = dict.fromkeys(self.PHASES, 0.0)
+        self._last = self.clock()
+
+    def mark(self, phase):
+        now = self.clock()
+        if self._current is not None:
+            self._current[phase] += now - self._last
+        self._last = now
+
+    def end_tick(self, counters=None):
+        """
+        Fecha o tick. counters: valores acumulados (ex.: ai_counters(ai));
+        o registro guarda a diferença para o tick anterior (no primeiro tick,
+        para zero).
+        """
+        record = self._current
+        if record is None:
+            return
+        record["tick"] = self.ticks
+        record["total"] = sum(record[phase] for phase in self.PHASES)
+
+        if counters is not None:
+            previous = self._previous_counters or {}
+            for name in self.COUNTERS:
+                delta = counters.get(name, 0) - previous.get(name, 0)
+                record[name] = delta
+                self.totals[name] += delta
+            self._previous_counters = dict(counters)
+
+        self.records.append(record)
+        self.ticks += 1
+        self._current = None
+
+    def add_sample(self, phase, seconds):
+        """Tempo medido fora de um tick (ex.: draw do frame) no registro mais recente."""
+        if self.records:
+            record = self.records[-1]
+            record[phase] += seconds
+            record["total"] += seconds
+
+    # ---------------------- estatísticas ----------------------
+
+    def samples(self, phase):
+        """Tempos (ms) da fase na janela atual."""
+        return np.array([record[phase] for record in self.records]) * 1e3
+
+    def summary(self):
+        """Por fase: média, p50, p95, p99 e máximo em ms; mais os contadores."""
+        phases = {}
+        for phase in self.PHASES + ("total",):
+            values = self.samples(phase)
+            if values.size == 0:
+                continue
+            p50, p95, p99 = np.percentile(values, (50, 95, 99))
+            phases[phase] = {
+                "mean": float(values.mean()),
+                "p50": float(p50),
+                "p95": float(p95),
+                "p99": float(p99),
+                "max": float(values.max()),
+            }
+        window = {
+            name: int(sum(record.get(name, 0) for record in self.records))
+            for name in self.COUNTERS
+        }
+        return {
+            "ticks": self.ticks,
+            "window": len(self.records),
+            "phases_ms": phases,
+            "counters_window": window,
+            "counters_total": dict(self.totals),
+        }
+
+    def histogram(self, phase="total", bins=12):
+        """Histograma (bordas em ms, contagens) da fase, com bins em escala log."""
+        values = self.samples(phase)
+        values = values[values > 0]
+        if values.size == 0:
+            return np.zeros(0), np.zeros(0, dtype=np.int64)
+        low, high = values.min(), values.max()
+        if high <= low:
+            high = low * 1.01
+        edges = np.geomspace(low, high, bins + 1)
+        counts, _ = np.histogram(values, bins=edges)
+        return edges, counts
+
+    # ---------------------- exportação ----------------------
+
+    def to_csv(self, path):
+        """Um tick por linha: tempos (ms) de cada fase e contadores."""
+        columns = ["tick", *self.PHASES, "total", *self.COUNTERS]
+        with open(path, "w", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow(columns)
+            for record in self.records:
+                writer.writerow([
+                    record["tick"],
+                    *(f"{record[phase] * 1e3:.4f}" for phase in self.PHASES + ("total",)),
+                    *(record.get(name, "") for name in self.COUNTERS),
+                ])
+
+    def to_json(self, path):
+        """Resumo + histogramas de cada fase."""
+        report = self.summary()
+        report["histograms_ms"] = {}
+        for phase in self.PHASES + ("total",):
+            edges, counts = self.histogram(phase)
+            report["histograms_ms"][phase] = {"edges": edges.tolist(), "counts": counts.tolist()}
+        with open(path, "w") as f:
+            json.dump(report, f, indent=2)
+
+    # ---------------------- overlay ----------------------
+
+    def draw_overlay(self, surface, font, pos=(8, 8)):
+        """
+        Quadro com p50/p99 por fase, contadores da janela e
+        o histograma do tempo total do tick. Retorna o rect desenhado.
+        """
+        import pygame
+
+        summary = self.summary()
+        lines = [f"ticks {summary['ticks']}  janela {summary['window']}"]
+        for phase, stats in summary["phases_ms"].items():
+            lines.append(f"{phase:<9} p50 {stats['p50']:6.2f}  p99 {stats['p99']:6.2f} ms")
+        counters = summary["counters_window"]
+        lines.append(" ".join(f"{name} {counters[name]}" for name in self.COUNTERS))
+
+        line_height = font.get_linesize()
+        width = max(font.size(line)[0] for line in lines) + 16
+        hist_height = 40
+        height = line_height * len(lines) + hist_height + 24
+
+        panel = pygame.Surface((width, height))
+        panel.fill((20, 20, 20))
+        for i, line in enumerate(lines):
+            panel.blit(font.render(line, True, (0, 255, 0)), (8, 8 + i * line_height))
+
+        _, counts = self.histogram("total")
+        if counts.size:
+            top = 16 + line_height * len(lines)
+            bar_width = (width - 16) / counts.size
+            peak = counts.max() or 1
+            for i, count in enumerate(counts):
+                bar_height = int(hist_height * count / peak)
+                rect = pygame.Rect(8 + int(i * bar_width), top + hist_height - bar_height,
+                                   max(1, int(bar_width) - 1), bar_height)
+                pygame.draw.rect(panel, (255, 255, 0), rect)
+
+        rect = surface.blit(panel, pos)
+        return rect
+
+
+def ai_counters(ai):
+    """Contadores acumulados de uma IA (A_Star / A_NEW_Star / Hamiltonian) para end_tick."""
+    if ai is None:
+        return None
+    search = getattr(ai, "grid_search", None)
+    return {
+        "expansions": search.total_expansions if search is not None else 0,
+        "replans": getattr(ai, "replans", 0),
+        "repairs": getattr(ai, "repairs", 0),
+        "cache_hits": getattr(ai, "cache_hits", 0),
+    }
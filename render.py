@@ -0,0 +1,117 @@
+import pygame
+
+
+class IncrementalRenderer:
+    """
+    Desenha só as células que mudaram desde o último frame (dirty rectangles).
+
+    Por tick mudam no máximo: a nova cabeça, a cabeça anterior (vira corpo),
+    a cauda que saiu e as foods realocadas. Essas células são repintadas e só
+    os seus rects vão para pygame.display.update. Frames sem tick novo não
+    desenham nada; frames com vários ticks fazem o redesenho completo. O
+    fundo (grid) fica em uma surface em cache, usada para apagar células e
+    para o redesenho completo.
+    """
+
+    def __init__(self, screen, game_map, player_snake, foods, cell_size, origin=(0, 0)):
+        self.screen = screen
+        self.player_snake = player_snake
+        self.foods = foods
+        self.cell_size = cell_size
+        self.origin = origin
+
+        # fundo desenhado uma vez (célula a célula, como grid.mapa.draw_grid)
+        width = game_map.cols * cell_size
+        height = game_map.rows * cell_size
+        self.background = pygame.Surface((width, height))
+        self.background.fill(game_map.BLACK)
+        game_map.draw_grid(self.background)
+
+        self._needs_full = True
+        self._prev_head = None
+        self._prev_tail = None
+        self._prev_foods = []
+        self._prev_tick = None
+
+    def invalidate(self):
+        """Força um redesenho completo no próximo draw (ex.: depois do menu)."""
+        self._needs_full = True
+
+    def repaint(self, screen_rect):
+        """Redesenha as células sob screen_rect (ex.: onde estava um overlay)."""
+        size = self.cell_size
+        x0, y0 = self.origin
+        area = pygame.Rect(screen_rect).clip(self.background.get_rect(topleft=(x0, y0)))
+        if not area.width or not area.height:
+            return
+        rows = range((area.top - y0) // size, (area.bottom - 1 - y0) // size + 1)
+        cols = range((area.left - x0) // size, (area.right - 1 - x0) // size + 1)
+        rects = [self._paint(row, col) for row in rows for col in cols]
+        pygame.display.update(rects)
+
+    # ---------------------- desenho ----------------------
+
+    def draw(self):
+        tick = self.player_snake.tick
+        if self._prev_tick is not None and tick == self._prev_tick and not self._needs_full:
+            return  # nada mudou desde o último frame
+
+        # mais de um tick desde o último frame (loop de passo fixo, turbo):
+        # as cabeças/caudas intermediárias não são rastreadas, redesenha tudo
+        if self._needs_full or self._prev_tick is None or tick - self._prev_tick > 1:
+            self._draw_full()
+        else:
+            self._draw_dirty()
+        self._prev_tick = tick
+
+        body = self.player_snake.body
+        self._prev_head = body[0] if len(body) else None
+        self._prev_tail = body[-1] if len(body) else None
+        self._prev_foods = [f.POS for f in self.foods]
+
+    def _draw_full(self):
+        x0, y0 = self.origin
+        self.screen.blit(self.background, (x0, y0))
+        for row, col in self.player_snake.body:
+            self._paint(row, col)
+        for f in self.foods:
+            if f.POS is not None:
+                self._paint(*f.POS)
+        pygame.display.update(self.background.get_rect(topleft=(x0, y0)))
+        self._needs_full = False
+
+    def _draw_dirty(self):
+        body = self.player_snake.body
+        dirty = {self._prev_head, self._prev_tail}
+        dirty.update(self._prev_foods)
+        if len(body):
+            dirty.add(body[0])
+            dirty.add(body[-1])
+        dirty.update(f.POS for f in self.foods)
+        dirty.discard(None)
+
+        rects = [self._paint(row, col) for row, col in dirty]
+        pygame.display.update(rects)
+
+    def _paint(self, row, col):
+        """Repinta uma célula com o estado atual e devolve o seu rect na tela."""
+        size = self.cell_size
+        x0, y0 = self.origin
+        rect = pygame.Rect(x0 + col * size, y0 + row * size, size, size)
+        pos = (row, col)
+        snake_ref = self.player_snake
+
+        # mesma ordem de camadas do Game.draw + draw_snake: fundo, cabeça,
+        # corpo, foods. O corpo é pintado depois da cabeça, então a cabeça só
+        # fica azul se nenhuma outra parte do corpo está na mesma célula
+        # (colisão consigo mesma, ou a cópia da cauda logo depois de crescer)
+        parts = snake_ref.occupancy[row * snake_ref.cols + col]
+        if any(f.POS == pos for f in self.foods):
+            pygame.draw.rect(self.screen, self.foods[0].YELLOW, rect)
+        elif parts == 1 and snake_ref.POS == pos:
+            pygame.draw.rect(self.screen, snake_ref.BLUE, rect)
+        elif parts:
+            pygame.draw.rect(self.screen, snake_ref.WHITE, rect)
+        else:
+            self.screen.blit(self.background, rect, pygame.Rect(col * size, row * size, size, size))
+        return rect
@@ -0,0 +1,391 @@
+"""
+Gravação e replay determinístico de episódios.
+
+    recorder = EpisodeRecorder()
+    engine.recorder = recorder; recorder.start(engine)   # ou Game(..., recorder=recorder)
+    ... jogo ...
+    recorder.finish(engine); recorder.save("jogo.snkr")
+
+    replay = Replay.load("jogo.snkr")
+    engine = replay.engine_at(12345)      # estado logo depois do tick 12345
+
+    python replay.py jogo.snkr [--tick N] [--fps 30] [--headless]
+
+Formato (.snkr, little-endian):
+    cabeçalho   struct HEADER (magic, versão, tabuleiro, seed, contagens, fim)
+    seções      u32 tamanho + bytes zlib, nesta ordem:
+      moves     2 bits por tick: índice em SnakeEngine.DIRECTIONS da orientação
+                efetiva (4 ticks por byte, o tick 0 nos bits baixos)
+      foods     eventos de realocação: tick (u32), slot (u8), célula (u32,
+                NO_CELL = sem espaço); o tick é engine.steps depois do movimento
+      keyframes a cada keyframe_interval ticks: tick, índice do próximo evento
+                de food, orientação, score, corpo e foods (células planas)
+"""
+import argparse
+import struct
+import sys
+import time
+import zlib
+from array import array
+
+from engine import SnakeEngine
+
+MAGIC = b"SNKR"
+VERSION = 1
+# magic, versão, rows, cols, n_foods, seed (-1 = None), keyframe_interval,
+# n_moves, condição final, score final
+HEADER = struct.Struct("<4sBHHBqIQBI")
+KEYFRAME = struct.Struct("<IIBII")   # tick, evento, orientação, score, len(corpo)
+NO_CELL = 0xFFFFFFFF
+CONDITIONS = ("alive", "win", "loss")
+MOVE_CODES = {direction: code for code, direction in enumerate(SnakeEngine.DIRECTIONS)}
+
+
+def _pack(values, typecode):
+    data = array(typecode, values)
+    if sys.byteorder == "big":
+        data.byteswap()
+    return data.tobytes()
+
+
+def _unpack(raw, typecode):
+    data = array(typecode)
+    data.frombytes(raw)
+    if sys.byteorder == "big":
+        data.byteswap()
+    return data
+
+
+# --------------------------------------------------------------------------
+#  GRAVAÇÃO
+# --------------------------------------------------------------------------
+
+class EpisodeRecorder:
+    """
+    Hook do SnakeEngine (engine.recorder): guarda a orientação de cada tick
+    em 2 bits, cada food realocada e um keyframe a cada keyframe_interval ticks.
+    """
+
+    def __init__(self, keyframe_interval=4096):
+        self.keyframe_interval = keyframe_interval
+        self.rows = self.cols = self.n_foods = 0
+        self.seed = None
+        self.moves = bytearray()
+        self.n_moves = 0
+        self.food_ticks = array("I")
+        self.food_slots = array("B")
+        self.food_cells = array("I")
+        self.keyframes = []
+        self.final_condition = "alive"
+        self.final_score = 0
+
+    def start(self, engine):
+        """Começa a gravar o episódio atual do engine (chamado também no reset)."""
+        self.rows, self.cols, self.n_foods = engine.rows, engine.cols, engine.n_foods
+        self.seed = engine.seed
+        self.moves = bytearray()
+        self.n_moves = 0
+        self.food_ticks = array("I")
+        self.food_slots = array("B")
+        self.food_cells = array("I")
+        self.keyframes = []
+        self._keyframe(engine)
+        engine.recorder = self
+
+    def finish(self, engine):
+        self.final_condition = engine.condition
+        self.final_score = engine.score
+
+    # ---------------------- hooks do engine ----------------------
+
+    def on_step(self, engine):
+        """Antes do tick engine.steps + 1: keyframe nos múltiplos do intervalo."""
+        steps = engine.steps
+        if steps and steps % self.keyframe_interval == 0:
+            self._keyframe(engine)
+
+    def on_move(self, orientation):
+        n = self.n_moves
+        if n & 3 == 0:
+            self.moves.append(0)
+        self.moves[-1] |= MOVE_CODES[orientation] << (2 * (n & 3))
+        self.n_moves = n + 1
+
+    def on_food(self, engine, f):
+        pos = f.POS
+        self.food_ticks.append(engine.steps)
+        self.food_slots.append(engine.foods.index(f))
+        self.food_cells.append(NO_CELL if pos is None else pos[0] * self.cols + pos[1])
+
+    def _keyframe(self, engine):
+        state = engine.snapshot()
+        state["event"] = len(self.food_ticks)
+        self.keyframes.append(state)
+
+    # ---------------------- arquivo ----------------------
+
+    def to_bytes(self):
+        cols = self.cols
+
+        keyframes = bytearray()
+        for state in self.keyframes:
+            keyframes += KEYFRAME.pack(
+                state["steps"], state["event"], MOVE_CODES[state["orientation"]],
+                state["score"], len(state["body"]),
+            )
+            keyframes += _pack((r * cols + c for r, c in state["body"]), "I")
+            keyframes += _pack(
+                (NO_CELL if pos is None else pos[0] * cols + pos[1] for pos in state["foods"]), "I"
+            )
+
+        foods = (
+            _pack(self.food_ticks, "I")
+            + _pack(self.food_slots, "B")
+            + _pack(self.food_cells, "I")
+        )
+
+        out = bytearray(HEADER.pack(
+            MAGIC, VERSION, self.rows, self.cols, self.n_foods,
+            -1 if self.seed is None else self.seed,
+            self.keyframe_interval, self.n_moves,
+            CONDITIONS.index(self.final_condition), self.final_score,
+        ))
+        for section in (bytes(self.moves), foods, bytes(keyframes)):
+            packed = zlib.compress(section)
+            out += struct.pack("<I", len(packed)) + packed
+        return bytes(out)
+
+    def save(self, path):
+        with open(path, "wb") as f:
+            f.write(self.to_bytes())
+
+
+# --------------------------------------------------------------------------
+#  REPLAY
+# --------------------------------------------------------------------------
+
+class ReplayEngine(SnakeEngine):
+    """SnakeEngine cujas foods vêm dos eventos gravados em vez do RNG."""
+
+    def __init__(self, replay, with_info=False, cell_size=1):
+        self.replay = replay
+        self._event = None  # None durante o reset do __init__ (foods descartadas)
+        super().__init__(replay.rows, replay.cols, n_foods=replay.n_foods,
+                         cell_size=cell_size, with_info=with_info)
+
+    def _place_food(self, f):
+        if self._event is None:
+            super()._place_food(f)
+            return
+
+        replay, i = self.replay, self._event
+        if i >= len(replay.food_ticks) or replay.food_ticks[i] != self.steps:
+            raise ValueError(f"replay inconsistente: sem evento de food no tick {self.steps}")
+        if self.foods[replay.food_slots[i]] is not f:
+            raise ValueError(f"replay inconsistente: food errada no tick {self.steps}")
+
+        cell = replay.food_cells[i]
+        if cell == NO_CELL:
+            f.POS = None
+        else:
+            self.free_cells.occupy(cell)
+            f.POS = divmod(cell, self.cols)
+        self._event = i + 1
+
+    def seek(self, tick):
+        """Vai para o estado logo depois de 'tick' ticks (keyframe + avanço)."""
+        replay = self.replay
+        if not 0 <= tick <= replay.n_moves:
+            raise IndexError(f"tick fora do replay: {tick} (0..{replay.n_moves})")
+        keyframe = replay.keyframes[min(tick // replay.keyframe_interval, len(replay.keyframes) - 1)]
+        # só volta ao keyframe se não dá para seguir do estado atual
+        if self._event is None or not keyframe["steps"] <= self.steps <= tick:
+            self.restore(keyframe)
+            self._event = keyframe["event"]
+        while self.steps < tick:
+            self.advance()
+
+    def advance(self):
+        """Um tick com o movimento gravado."""
+        return self.step(self.replay.move_at(self.steps))
+
+
+class Replay:
+    """Episódio gravado: movimentos, eventos de food e keyframes."""
+
+    def __init__(self, rows, cols, n_foods, seed, keyframe_interval, n_moves,
+                 moves, food_ticks, food_slots, food_cells, keyframes,
+                 final_condition, final_score):
+        self.rows = rows
+        self.cols = cols
+        self.n_foods = n_foods
+        self.seed = seed
+        self.keyframe_interval = keyframe_interval
+        self.n_moves = n_moves
+        self.moves = moves
+        self.food_ticks = food_ticks
+        self.food_slots = food_slots
+        self.food_cells = food_cells
+        self.keyframes = keyframes
+        self.final_condition = final_condition
+        self.final_score = final_score
+
+    @classmethod
+    def from_bytes(cls, data):
+        (magic, version, rows, cols, n_foods, seed, interval, n_moves,
+         condition, score) = HEADER.unpack_from(data, 0)
+        if magic != MAGIC:
+            raise ValueError("não é um arquivo de replay (.snkr)")
+        if version != VERSION:
+            raise ValueError(f"versão de replay não suportada: {version}")
+
+        sections = []
+        offset = HEADER.size
+        for _ in range(3):
+            (size,) = struct.unpack_from("<I", data, offset)
+            offset += 4
+            sections.append(zlib.decompress(data[offset:offset + size]))
+            offset += size
+        moves, foods, raw_keyframes = sections
+
+        n_events = len(foods) // 9
+        food_ticks = _unpack(foods[:4 * n_events], "I")
+        food_slots = _unpack(foods[4 * n_events:5 * n_events], "B")
+        food_cells = _unpack(foods[5 * n_events:], "I")
+
+        keyframes = []
+        offset = 0
+        while offset < len(raw_keyframes):
+            steps, event, orientation, kf_score, length = KEYFRAME.unpack_from(raw_keyframes, offset)
+            offset += KEYFRAME.size
+            body = _unpack(raw_keyframes[offset:offset + 4 * length], "I")
+            offset += 4 * length
+            food_raw = _unpack(raw_keyframes[offset:offset + 4 * n_foods], "I")
+            offset += 4 * n_foods
+            keyframes.append({
+                "steps": steps,
+                "event": event,
+                "score": kf_score,
+                "condition": "alive",
+                "orientation": SnakeEngine.DIRECTIONS[orientation],
+                "body": [divmod(cell, cols) for cell in body],
+                "foods": [None if cell == NO_CELL else divmod(cell, cols) for cell in food_raw],
+            })
+
+        return cls(rows, cols, n_foods, None if seed == -1 else seed, interval, n_moves,
+                   moves, food_ticks, food_slots, food_cells, keyframes,
+                   CONDITIONS[condition], score)
+
+    @classmethod
+    def load(cls, path):
+        with open(path, "rb") as f:
+            return cls.from_bytes(f.read())
+
+    def move_at(self, tick):
+        """Direção gravada para o tick de índice 'tick' (0 = primeiro movimento)."""
+        code = (self.moves[tick >> 2] >> (2 * (tick & 3))) & 3
+        return SnakeEngine.DIRECTIONS[code]
+
+    def engine_at(self, tick, with_info=False, cell_size=1):
+        engine = ReplayEngine(self, with_info=with_info, cell_size=cell_size)
+        engine.seek(tick)
+        return engine
+
+    def verify(self):
+        """
+        Reproduz o episódio inteiro desde o tick 0 e confere o resultado
+        gravado e cada keyframe no caminho.
+        """
+        engine = self.engine_at(0)
+        keyframes = iter(self.keyframes[1:])
+        upcoming = next(keyframes, None)
+        while engine.steps < self.n_moves:
+            engine.advance()
+            if upcoming is not None and engine.steps == upcoming["steps"]:
+                state = engine.snapshot()
+                if any(state[key] != upcoming[key] for key in ("body", "foods", "score", "orientation")):
+                    return False
+                upcoming = next(keyframes, None)
+        return engine.condition == self.final_condition and engine.score == self.final_score
+
+
+# --------------------------------------------------------------------------
+#  CLI: replay headless ou renderizado
+# --------------------------------------------------------------------------
+
+def play(replay, start_tick=0, fps=30, cell_size=20):
+    """
+    Replay na tela: espaço pausa, setas avançam/voltam um tick (pausado),
+    PageUp/PageDown pulam um keyframe.
+    """
+    import pygame
+    import grid
+    from render import IncrementalRenderer
+
+    pygame.init()
+    screen = pygame.display.set_mode((replay.cols * cell_size, replay.rows * cell_size))
+    pygame.display.set_caption("Snake replay")
+    game_map = grid.mapa(replay.rows, replay.cols, cell_size)
+    engine = replay.engine_at(start_tick, cell_size=cell_size)
+
+    def renderer_for(engine):
+        # restore cria snake/foods novas: o renderer precisa das referências atuais
+        return IncrementalRenderer(screen, game_map, engine.player_snake, engine.foods, cell_size)
+
+    renderer = renderer_for(engine)
+    clock = pygame.time.Clock()
+    paused = False
+    running = True
+    while running:
+        target = None
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT:
+                running = False
+            elif event.type == pygame.KEYDOWN:
+                if event.key == pygame.K_SPACE:
+                    paused = not paused
+                elif event.key == pygame.K_RIGHT:
+                    target = engine.steps + 1
+                elif event.key == pygame.K_LEFT:
+                    target = engine.steps - 1
+                elif event.key == pygame.K_PAGEUP:
+                    target = engine.steps + replay.keyframe_interval
+                elif event.key == pygame.K_PAGEDOWN:
+                    target = engine.steps - replay.keyframe_interval
+
+        if target is None and not paused and engine.steps < replay.n_moves:
+            engine.advance()
+        elif target is not None:
+            snake_before = engine.player_snake
+            engine.seek(max(0, min(target, replay.n_moves)))
+            if engine.player_snake is not snake_before:
+                renderer = renderer_for(engine)
+
+        renderer.draw()
+        pygame.display.set_caption(f"Snake replay  tick {engine.steps}/{replay.n_moves}  score {engine.score}")
+        clock.tick(fps)
+    pygame.quit()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Replay de um episódio gravado (.snkr).")
+    parser.add_argument("path")
+    parser.add_argument("--tick", type=int, default=0, help="tick inicial")
+    parser.add_argument("--fps", type=int, default=30)
+    parser.add_argument("--headless", action="store_true",
+                        help="só reproduz até o fim e confere o resultado gravado")
+    args = parser.parse_args(argv)
+
+    replay = Replay.load(args.path)
+    if args.headless:
+        start = time.perf_counter()
+        ok = replay.verify()
+        elapsed = time.perf_counter() - start
+        print(f"{replay.n_moves} ticks em {elapsed:.2f}s, final {replay.final_condition} "
+              f"score {replay.final_score}: {'ok' if ok else 'DIVERGENTE'}")
+        sys.exit(0 if ok else 1)
+    play(replay, args.tick, args.fps)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,4 +1,50 @@
-import pygame
+from array import array
+from collections import deque
+from collections.abc import Sequence
+
+
+class _BodyView(Sequence):
+    """
+    Visão somente leitura do corpo da snake (cabeça -> cauda).
+    Compatível com o uso antigo de lista: len, índices, fatias, iteração e 'in'
+    (o 'in' é O(1) pela grade de ocupação).
+    """
+
+    __slots__ = ("_snake",)
+
+    def __init__(self, owner):
+        self._snake = owner
+
+    def __len__(self):
+        return len(self._snake._cells)
+
+    def __getitem__(self, index):
+        cells = self._snake._cells
+        if isinstance(index, slice):
+            return list(cells)[index]
+        return cells[index]
+
+    def __iter__(self):
+        return iter(self._snake._cells)
+
+    def __reversed__(self):
+        return reversed(self._snake._cells)
+
+    def __contains__(self, pos):
+        return self._snake.occupies(pos)
+
+    def age_of(self, pos):
+        """Como index(pos) para uma célula do corpo, mas O(1) (ver snake.age_of)."""
+        return self._snake.age_of(pos)
+
+    def __eq__(self, other):
+        if isinstance(other, (_BodyView, list, tuple)):
+            return list(self) == list(other)
+        return NotImplemented
+
+    def __repr__(self):
+        return repr(list(self._snake._cells))
+
 
 class snake:
     WHITE = (255, 255, 255)
@@ -19,14 +65,89 @@ class snake:
         # orientação inicial
         self.orientation = "right"  # up, down, left, right
 
-        # corpo = lista de (row, col) da cabeça até a cauda
-        self.body = [
+        # corpo = deque de (row, col) da cabeça até a cauda
+        self._cells = deque([
             (center_row, center_col),         # cabeça (azul)
             (center_row, center_col - 1),     # corpo
             (center_row, center_col - 2),     # corpo
-        ]
+        ])
+        self._body_view = _BodyView(self)
+
+        # occupancy[r * cols + c]: quantas partes do corpo estão na célula
+        # entered[r * cols + c]: tick em que a cabeça entrou na célula,
+        # de modo que o índice no corpo é tick - entered (ver age_of)
+        self.tick = 0
+        self.occupancy = bytearray(rows * cols)
+        self.entered = array("q", bytes(8 * rows * cols))
+        for index, (row, col) in enumerate(self._cells):
+            cell = row * cols + col
+            self.occupancy[cell] += 1
+            self.entered[cell] = -index
+
+        # índice de células livres compartilhado com as foods (opcional)
+        self.free_cells = None
+
+    @property
+    def body(self):
+        """Corpo (cabeça -> cauda) como visão somente leitura."""
+        return self._body_view
+
+    def attach_free_cells(self, free_cells):
+        """Passa a manter um FreeCellIndex atualizado a cada movimento."""
+        self.free_cells = free_cells
+        for row, col in self._cells:
+            free_cells.occupy(row * self.cols + col)
+
+    def restore(self, cells, orientation, tick=0):
+        """
+        Recoloca o corpo (cabeça -> cauda, como em body) e a orientação, como
+        se a snake tivesse andado 'tick' vezes. Usado antes de attach_free_cells
+        (ex.: SnakeEngine.restore ao voltar a um keyframe do replay).
+        """
+        self._cells = deque(cells)
+        self.POS = self._cells[0]
+        self.orientation = orientation
+        self.tick = tick
+        self.occupancy = bytearray(self.rows * self.cols)
+        # da cauda para a cabeça: em células repetidas vale a parte mais nova
+        for index in range(len(self._cells) - 1, -1, -1):
+            row, col = self._cells[index]
+            cell = row * self.cols + col
+            self.occupancy[cell] += 1
+            self.entered[cell] = tick - index
+
+    # ---------------------- consultas O(1) ----------------------
+
+    def occupies(self, pos):
+        """True se alguma parte do corpo está em pos=(row, col)."""
+        try:
+            row, col = pos
+        except (TypeError, ValueError):
+            return False
+        if not (0 <= row < self.rows and 0 <= col < self.cols):
+            return False
+        return self.occupancy[row * self.cols + col] > 0
+
+    def age_of(self, pos):
+        """Índice no corpo (0 = cabeça) da parte em pos, ou -1 se livre."""
+        if not self.occupies(pos):
+            return -1
+        return self.tick - self.entered[pos[0] * self.cols + pos[1]]
+
+    def collides_with_self(self):
+        """Equivale a 'POS in body[2:]' sem fatiar nem varrer o corpo."""
+        cells = self._cells
+        head = cells[0]
+        count = self.occupancy[head[0] * self.cols + head[1]] - 1
+        if len(cells) > 1 and cells[1] == head:
+            count -= 1
+        return count > 0
+
+    # ---------------------- desenho ----------------------
 
     def draw_snake(self, surface):
+        import pygame
+
         # desenha corpo (branco) e por último a cabeça (azul)
         for index, (row, col) in enumerate(self.body):
             x = col * self.cell_size
@@ -40,12 +161,15 @@ class snake:
 
             pygame.draw.rect(surface, color, rect)
 
+    # ---------------------- movimento ----------------------
+
     def grow_snake(self):
         """Adiciona uma nova célula ao final do corpo da snake."""
-        tail = self.body[-1]
+        tail = self._cells[-1]
         # adiciona mais uma célula na mesma posição da cauda;
         # na próxima movimentação, ela "cresce" para trás
-        self.body.append(tail)
+        self._cells.append(tail)
+        self.occupancy[tail[0] * self.cols + tail[1]] += 1
 
     def move_snake(self):
         """Move a snake 1 célula na direção atual com wrap nas bordas."""
@@ -70,12 +194,21 @@ class snake:
         # novo POS da cabeça
         self.POS = new_head
 
-        # mover corpo
-        new_body = [new_head]
-        for i in range(1, len(self.body)):
-            new_body.append(self.body[i - 1])
-
-        self.body = new_body
+        # mover corpo: sai a cauda, entra a nova cabeça (O(1))
+        tail_row, tail_col = self._cells.pop()
+        tail = tail_row * self.cols + tail_col
+        self.occupancy[tail] -= 1
+
+        cell = new_row * self.cols + new_col
+        self._cells.appendleft(new_head)
+        self.occupancy[cell] += 1
+        self.tick += 1
+        self.entered[cell] = self.tick
+
+        if self.free_cells is not None:
+            if self.occupancy[tail] == 0:
+                self.free_cells.release(tail)
+            self.free_cells.occupy(cell)
 
     # def user_move(self):
     #     """Lê as teclas e ajusta a orientação da snake."""
@@ -0,0 +1,333 @@
+"""
+Ambiente no estilo gym/gymnasium sobre o SnakeEngine (sem depender do gym).
+
+    env = SnakeEnv(30, 40)
+    obs, info = env.reset(seed=0)
+    while True:
+        obs, reward, terminated, truncated, info = env.step(action)   # 0..3 = up, down, left, right
+        if terminated or truncated:
+            break
+
+Vários jogos ao mesmo tempo:
+  - SyncVectorEnv: N ambientes no mesmo processo, observações empilhadas
+  - AsyncVectorEnv: os ambientes divididos entre processos; observações,
+    ações, recompensas e flags ficam em memória compartilhada
+    (multiprocessing.RawArray), então o array devolvido ao learner é o mesmo
+    em que os workers escrevem, sem cópia nem pickle; pelo pipe só passam o
+    comando e os dicts de info
+
+Nos dois wrappers um ambiente que termina é reiniciado na hora (a próxima
+observação já é a do novo episódio); a última observação do episódio vai em
+info["final_observation"]. Os arrays devolvidos são reescritos a cada
+chamada: copie o que precisar guardar.
+"""
+import multiprocessing
+import traceback
+from functools import partial
+
+import numpy as np
+
+from engine import SnakeEngine
+from ALGO_PLAYS.NEAT.observations import make_encoder
+
+
+# --------------------------------------------------------------------------
+#  UM AMBIENTE
+# --------------------------------------------------------------------------
+
+class SnakeEnv:
+    """
+    Um jogo com reset(seed) / step(action) e observações do encoder
+    (ver ALGO_PLAYS/NEAT/observations.py; "basic" lê o game_info).
+
+    Ações: índice em ACTIONS (0..3), a direção como texto, ou None / -1 para
+    manter a orientação. terminated = vitória ou derrota; truncated =
+    max_steps ticks ou max_hunger ticks sem comer (padrão rows * cols).
+    """
+
+    ACTIONS = SnakeEngine.DIRECTIONS
+
+    REWARD_FOOD = 1.0
+    REWARD_LOSS = -1.0
+    REWARD_WIN = 1.0
+
+    def __init__(self, rows=30, cols=40, n_foods=3, encoder="basic", max_steps=None, max_hunger=None):
+        self.rows = rows
+        self.cols = cols
+        self.max_steps = max_steps
+        self.max_hunger = rows * cols if max_hunger is None else max_hunger
+
+        self.engine = SnakeEngine(rows, cols, n_foods=n_foods, with_info=True)
+        self.encoder = make_encoder(encoder, rows, cols)
+        self.observation_shape = (self.encoder.num_inputs,)
+        self.n_actions = len(self.ACTIONS)
+        self._hunger = 0
+        self._needs_reset = True
+
+    def reset(self, seed=None, out=None):
+        """Novo episódio; com seed, reinicia também o RNG das foods. Retorna (obs, info)."""
+        self.engine.reset(seed)
+        self._hunger = 0
+        self._needs_reset = False
+        return self._observe(out), self._info()
+
+    def step(self, action, out=None):
+        """Avança um tick. Retorna (obs, reward, terminated, truncated, info)."""
+        if self._needs_reset:
+            raise RuntimeError("episódio encerrado: chame reset() antes de step()")
+
+        engine = self.engine
+        if isinstance(action, str) or action is None:
+            direction = action
+        else:
+            direction = self.ACTIONS[action] if action >= 0 else None
+        engine.step(direction)
+
+        reward = 0.0
+        if engine.last_eaten is not None:
+            reward += self.REWARD_FOOD
+            self._hunger = 0
+        else:
+            self._hunger += 1
+        if engine.condition == "loss":
+            reward += self.REWARD_LOSS
+        elif engine.condition == "win":
+            reward += self.REWARD_WIN
+
+        terminated = engine.done
+        truncated = not terminated and (
+            self._hunger >= self.max_hunger
+            or (self.max_steps is not None and engine.steps >= self.max_steps)
+        )
+        self._needs_reset = terminated or truncated
+        return self._observe(out), reward, terminated, truncated, self._info()
+
+    def _observe(self, out=None):
+        """Observação em out (ou em um array novo), sempre um ndarray float64."""
+        if out is None:
+            out = np.empty(self.observation_shape)
+        return self.encoder.encode(self.engine, out)
+
+    def _info(self):
+        engine = self.engine
+        return {"score": engine.score, "steps": engine.steps, "condition": engine.condition}
+
+
+def make_env_fns(n_envs, **env_kwargs):
+    """Lista de construtores de SnakeEnv (partial: vale para fork e spawn)."""
+    return [partial(SnakeEnv, **env_kwargs) for _ in range(n_envs)]
+
+
+# --------------------------------------------------------------------------
+#  VETORIZADO NO MESMO PROCESSO
+# --------------------------------------------------------------------------
+
+class SyncVectorEnv:
+    """
+    N SnakeEnv em sequência, com observações em um array (N, *shape).
+    Os buffers podem vir de fora (o AsyncVectorEnv passa fatias da memória
+    compartilhada); cada ambiente escreve direto na sua linha.
+    """
+
+    def __init__(self, env_fns, observations=None, rewards=None, terminated=None, truncated=None):
+        self.envs = [fn() for fn in env_fns]
+        self.num_envs = n = len(self.envs)
+        self.observation_shape = self.envs[0].observation_shape
+        self.n_actions = self.envs[0].n_actions
+
+        self.observations = np.zeros((n,) + self.observation_shape) if observations is None else observations
+        self.rewards = np.zeros(n) if rewards is None else rewards
+        self.terminated = np.zeros(n, dtype=bool) if terminated is None else terminated
+        self.truncated = np.zeros(n, dtype=bool) if truncated is None else truncated
+
+    def reset(self, seed=None):
+        """Reinicia todos; com seed, o ambiente i usa seed + i. Retorna (obs, infos)."""
+        infos = []
+        for i, env in enumerate(self.envs):
+            _, info = env.reset(None if seed is None else seed + i, out=self.observations[i])
+            infos.append(info)
+        self.rewards[:] = 0.0
+        self.terminated[:] = False
+        self.truncated[:] = False
+        return self.observations, infos
+
+    def step(self, actions):
+        """Um tick em todos. Retorna (obs, rewards, terminated, truncated, infos)."""
+        infos = []
+        for i, env in enumerate(self.envs):
+            obs, reward, terminated, truncated, info = env.step(actions[i], out=self.observations[i])
+            if terminated or truncated:
+                info["final_observation"] = obs.copy()
+                env.reset(out=self.observations[i])
+            self.rewards[i] = reward
+            self.terminated[i] = terminated
+            self.truncated[i] = truncated
+            infos.append(info)
+        return self.observations, self.rewards, self.terminated, self.truncated, infos
+
+    def close(self):
+        pass
+
+
+# --------------------------------------------------------------------------
+#  VETORIZADO EM SUBPROCESSOS COM MEMÓRIA COMPARTILHADA
+# --------------------------------------------------------------------------
+
+def _shared_view(raw, dtype, shape):
+    return np.frombuffer(raw, dtype=dtype).reshape(shape)
+
+
+def _async_worker(pipe, env_fns, start, stop, buffers, obs_shape):
+    """Processo de um AsyncVectorEnv: roda os ambientes [start, stop) sobre as linhas compartilhadas."""
+    try:
+        obs_raw, actions_raw, rewards_raw, terminated_raw, truncated_raw = buffers
+        n = len(rewards_raw)
+        actions = _shared_view(actions_raw, np.int64, (n,))[start:stop]
+        envs = SyncVectorEnv(
+            env_fns,
+            observations=_shared_view(obs_raw, np.float64, (n,) + obs_shape)[start:stop],
+            rewards=_shared_view(rewards_raw, np.float64, (n,))[start:stop],
+            terminated=_shared_view(terminated_raw, np.bool_, (n,))[start:stop],
+            truncated=_shared_view(truncated_raw, np.bool_, (n,))[start:stop],
+        )
+        while True:
+            command, argument = pipe.recv()
+            if command == "step":
+                pipe.send(("ok", envs.step(actions)[4]))
+            elif command == "reset":
+                pipe.send(("ok", envs.reset(None if argument is None else argument + start)[1]))
+            elif command == "close":
+                pipe.send(("ok", None))
+                break
+    except (KeyboardInterrupt, EOFError):
+        pass
+    except Exception:
+        pipe.send(("error", traceback.format_exc()))
+    finally:
+        pipe.close()
+
+
+class AsyncVectorEnv:
+    """
+    N SnakeEnv divididos entre n_workers processos (padrão: um por CPU, no
+    máximo um por ambiente). step(actions) escreve as ações no buffer
+    compartilhado, acorda os workers e espera todos; a observação devolvida
+    é uma view da memória compartilhada.
+
+    step_async / step_wait separam o envio da espera, para o learner
+    calcular algo enquanto os jogos andam.
+    """
+
+    def __init__(self, env_fns, n_workers=None):
+        self.num_envs = n = len(env_fns)
+        probe = env_fns[0]()
+        self.observation_shape = probe.observation_shape
+        self.n_actions = probe.n_actions
+        del probe
+
+        obs_size = int(np.prod(self.observation_shape))
+        buffers = (
+            multiprocessing.RawArray("d", n * obs_size),
+            multiprocessing.RawArray("q", n),
+            multiprocessing.RawArray("d", n),
+            multiprocessing.RawArray("B", n),
+            multiprocessing.RawArray("B", n),
+        )
+        self.observations = _shared_view(buffers[0], np.float64, (n,) + self.observation_shape)
+        self.actions = _shared_view(buffers[1], np.int64, (n,))
+        self.rewards = _shared_view(buffers[2], np.float64, (n,))
+        self.terminated = _shared_view(buffers[3], np.bool_, (n,))
+        self.truncated = _shared_view(buffers[4], np.bool_, (n,))
+
+        n_workers = min(n, n_workers or multiprocessing.cpu_count())
+        bounds = np.linspace(0, n, n_workers + 1).astype(int)
+        self._pipes = []
+        self._processes = []
+        for start, stop in zip(bounds[:-1], bounds[1:]):
+            parent, child = multiprocessing.Pipe()
+            process = multiprocessing.Process(
+                target=_async_worker,
+                args=(child, env_fns[start:stop], int(start), int(stop), buffers, self.observation_shape),
+                daemon=True,
+            )
+            process.start()
+            child.close()
+            self._pipes.append(parent)
+            self._processes.append(process)
+        self.closed = False
+        self._waiting = False
+
+    def _call(self, command, argument=None):
+        for pipe in self._pipes:
+            pipe.send((command, argument))
+
+    def _gather(self):
+        infos = []
+        for pipe in self._pipes:
+            status, payload = pipe.recv()
+            if status == "error":
+                self.close(terminate=True)
+                raise RuntimeError(f"worker do AsyncVectorEnv falhou:\n{payload}")
+            infos.extend(payload)
+        return infos
+
+    def reset(self, seed=None):
+        """Reinicia todos; com seed, o ambiente i usa seed + i. Retorna (obs, infos)."""
+        self._call("reset", seed)
+        return self.observations, self._gather()
+
+    def step_async(self, actions):
+        # o buffer compartilhado é int64: direções em texto viram o índice em ACTIONS
+        self.actions[:] = [self._action_index(a) for a in actions]
+        self._call("step")
+        self._waiting = True
+
+    @staticmethod
+    def _action_index(action):
+        if action is None:
+            return -1
+        if isinstance(action, str):
+            if action not in SnakeEnv.ACTIONS:
+                raise ValueError(f"ação inválida: {action!r} (use {SnakeEnv.ACTIONS}, um índice ou None)")
+            return SnakeEnv.ACTIONS.index(action)
+        return action
+
+    def step_wait(self):
+        infos = self._gather()
+        self._waiting = False
+        return self.observations, self.rewards, self.terminated, self.truncated, infos
+
+    def step(self, actions):
+        """Um tick em todos. Retorna (obs, rewards, terminated, truncated, infos)."""
+        self.step_async(actions)
+        return self.step_wait()
+
+    def close(self, terminate=False):
+        if self.closed:
+            return
+        self.closed = True
+        if not terminate:
+            if self._waiting:
+                self._gather()
+            try:
+                self._call("close")
+                for pipe in self._pipes:
+                    pipe.recv()
+            except (BrokenPipeError, EOFError):
+                terminate = True
+        for process in self._processes:
+            if terminate:
+                process.terminate()
+            process.join()
+        for pipe in self._pipes:
+            pipe.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def __del__(self):
+        if not getattr(self, "closed", True):
+            self.close(terminate=True)
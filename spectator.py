@@ -0,0 +1,172 @@
+import math
+import time
+
+import numpy as np
+import pygame
+
+from engine import SnakeEngine
+from strategies import AI_MODES, make_policy, needs_info
+
+# paleta das miniaturas: 0 fundo, 1 corpo, 2 cabeça, 3 food
+PALETTE = np.array(
+    [(0, 0, 0), (255, 255, 255), (0, 0, 255), (255, 255, 0)],
+    dtype=np.uint8,
+)
+LABEL_COLOR = (0, 255, 0)
+BORDER_COLOR = (40, 40, 40)
+
+
+class SpectatorSlot:
+    """Um jogo headless da grade: engine + política de IA + estatísticas."""
+
+    def __init__(self, mode, rows, cols, n_foods, seed):
+        self.mode = mode
+        self.rows = rows
+        self.cols = cols
+        self.seed = seed
+        self.engine = SnakeEngine(rows, cols, n_foods=n_foods, seed=seed, with_info=needs_info(mode))
+        self.policy = make_policy(mode, rows, cols)
+        self.episodes = 0
+        self.best_score = 0
+        # sem comer por rows * cols ticks = preso em loop (como em play_episode)
+        self.hunger_limit = rows * cols
+        self._hunger = 0
+
+    def step(self):
+        engine = self.engine
+        engine.step(self.policy(engine))
+        self._hunger = 0 if engine.last_eaten is not None else self._hunger + 1
+        if engine.done or self._hunger >= self.hunger_limit:
+            self.best_score = max(self.best_score, engine.score)
+            self.restart()
+
+    def restart(self):
+        """Novo episódio com a próxima seed; a mesma IA, sem o cache do episódio anterior."""
+        self.episodes += 1
+        self.seed += 1
+        self._hunger = 0
+        self.engine.reset(self.seed)
+        self.policy.reset()
+
+    def cell_codes(self, out):
+        """Escreve em out (rows, cols) os códigos da PALETTE a partir da ocupação."""
+        engine = self.engine
+        occupancy = np.frombuffer(engine.player_snake.occupancy, dtype=np.uint8)
+        np.minimum(occupancy.reshape(self.rows, self.cols), 1, out=out)
+        head_r, head_c = engine.player_snake.POS
+        out[head_r, head_c] = 2
+        for r, c in engine.food_positions():
+            out[r, c] = 3
+        return out
+
+
+class Spectator:
+    """
+    Vários jogos de IA (cada um com sua seed) em miniaturas numa só janela.
+
+    A simulação não depende do fps da tela: entre dois frames todos os jogos
+    avançam quantos ticks couberem (ou no ritmo fixo de sim_hz), e o desenho
+    acontece no máximo render_fps vezes por segundo. Cada miniatura vem da
+    ocupação da snake (NumPy) -> pygame.surfarray -> pygame.transform.scale,
+    sem desenhar um rect por célula.
+    """
+
+    def __init__(self, screen, rows, cols, modes=AI_MODES, games_per_mode=3,
+                 n_foods=3, seed=0, sim_hz=None, render_fps=30):
+        self.screen = screen
+        self.rows = rows
+        self.cols = cols
+        self.sim_hz = sim_hz          # ticks por segundo de cada jogo (None = o máximo possível)
+        self.render_fps = render_fps
+
+        # seeds espaçadas: cada slot avança a sua a cada episódio
+        self.slots = []
+        for mode in modes:
+            for _ in range(games_per_mode):
+                slot_seed = seed + 1000 * len(self.slots)
+                self.slots.append(SpectatorSlot(mode, rows, cols, n_foods, slot_seed))
+
+        self.ticks = 0
+        self.font = pygame.font.SysFont(None, 20)
+        self._layout()
+
+        # buffers reaproveitados a cada frame
+        self._codes = np.zeros((rows, cols), dtype=np.uint8)
+        self._thumb = pygame.Surface((cols, rows))
+
+    def _layout(self):
+        """Divide a janela em uma grade de tiles com o aspecto do tabuleiro."""
+        n = len(self.slots)
+        width, height = self.screen.get_size()
+        tiles_x = max(1, math.ceil(math.sqrt(n * width * self.rows / (height * self.cols))))
+        tiles_x = min(tiles_x, n)
+        tiles_y = math.ceil(n / tiles_x)
+
+        tile_w = width // tiles_x
+        tile_h = height // tiles_y
+        scale = min(tile_w / self.cols, tile_h / self.rows)
+        # 1 px de borda de cada lado, sem deixar o rect com tamanho zero ou negativo
+        thumb_size = (max(1, int(self.cols * scale) - 2), max(1, int(self.rows * scale) - 2))
+
+        self.tiles = []
+        for i in range(n):
+            tx, ty = i % tiles_x, i // tiles_x
+            self.tiles.append(pygame.Rect(tx * tile_w + 1, ty * tile_h + 1, *thumb_size))
+
+    # ---------------------- loop ----------------------
+
+    def run(self):
+        running = True
+        frame_time = 1.0 / self.render_fps
+        tick_time = 1.0 / self.sim_hz if self.sim_hz else None
+
+        now = time.perf_counter()
+        next_frame = now
+        next_tick = now
+        while running:
+            for event in pygame.event.get():
+                if event.type == pygame.QUIT:
+                    running = False
+                elif event.type == pygame.KEYDOWN and event.key == pygame.K_ESCAPE:
+                    running = False
+
+            # simula até a hora do próximo frame
+            if tick_time is None:
+                self.step_all()
+                while time.perf_counter() < next_frame:
+                    self.step_all()
+            else:
+                now = time.perf_counter()
+                while next_tick <= now:
+                    self.step_all()
+                    next_tick += tick_time
+                # atrasado demais: descarta o atraso em vez de tentar recuperar
+                if now - next_tick > frame_time:
+                    next_tick = now
+
+            now = time.perf_counter()
+            if now >= next_frame:
+                self.draw()
+                next_frame = max(next_frame + frame_time, now)
+            elif tick_time is not None:
+                time.sleep(max(0.0, min(next_frame, next_tick) - now))
+
+    def step_all(self):
+        for slot in self.slots:
+            slot.step()
+        self.ticks += 1
+
+    # ---------------------- desenho ----------------------
+
+    def draw(self):
+        self.screen.fill(BORDER_COLOR)
+        codes, thumb = self._codes, self._thumb
+        for slot, rect in zip(self.slots, self.tiles):
+            slot.cell_codes(codes)
+            # surfarray indexa [x, y] = [col, row]
+            pygame.surfarray.blit_array(thumb, PALETTE[codes].transpose(1, 0, 2))
+            pygame.transform.scale(thumb, rect.size, self.screen.subsurface(rect))
+
+            label = f"{slot.mode} #{slot.episodes}  score {slot.engine.score}  best {slot.best_score}"
+            self.screen.blit(self.font.render(label, True, LABEL_COLOR), (rect.x + 4, rect.y + 4))
+        pygame.display.flip()
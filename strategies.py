@@ -0,0 +1,54 @@
+import os
+
+# modos de IA que jogam sozinhos sobre um SnakeEngine
+AI_MODES = ("A_STAR", "A_NEW_STAR", "HAMILTON", "NEAT")
+
+NEAT_CONFIG = os.path.join(os.path.dirname(os.path.abspath(__file__)), "ALGO_PLAYS", "NEAT", "config.txt")
+
+
+def needs_info(mode):
+    """NEAT lê o estado pelo game_info; as buscas leem o corpo direto da snake."""
+    return mode == "NEAT"
+
+
+def make_policy(mode, rows, cols):
+    """
+    Cria a política de um modo de IA: uma função policy(engine) -> direção
+    (ou None para manter a orientação), chamada antes de cada engine.step.
+    policy.reset() limpa o estado do episódio (caminho em cache, sentido do
+    ciclo), para reaproveitar a mesma política no próximo jogo.
+
+    Os imports ficam dentro de cada ramo para só carregar o que o modo usa
+    (ex.: neat-python apenas no modo NEAT).
+    """
+    if mode == "A_STAR":
+        from ALGO_PLAYS.A_STAR import A_Star
+        return _search_policy(A_Star(rows, cols))
+
+    if mode == "A_NEW_STAR":
+        from ALGO_PLAYS.A_NEW_STAR import A_NEW_Star
+        return _search_policy(A_NEW_Star(rows, cols))
+
+    if mode == "HAMILTON":
+        from ALGO_PLAYS.HAMILTON import Hamiltonian
+        return _search_policy(Hamiltonian(rows, cols))
+
+    if mode == "NEAT":
+        from ALGO_PLAYS.NEAT.NEAT import NEAT_AI
+        ai = NEAT_AI(rows, cols, NEAT_CONFIG)
+
+        def policy(engine):
+            return ai.choose_action(engine.info)
+        # a rede não guarda estado entre ticks
+        policy.reset = lambda: None
+        return policy
+
+    raise ValueError(f"modo de IA desconhecido: {mode}")
+
+
+def _search_policy(ai):
+    def policy(engine):
+        player_snake = engine.player_snake
+        return ai.next_direction(player_snake.POS, engine.food_positions(), player_snake.body)
+    policy.reset = ai.reset
+    return policy
@@ -1,11 +1,11 @@
-import pygame
-
 class UserController:
     """Responsável por ler o input do usuário e mudar a orientação da snake."""
     def __init__(self, snake_ref):
         self.snake = snake_ref
 
     def handle_input(self):
+        import pygame
+
         keys = pygame.key.get_pressed()
 
         if keys[pygame.K_RIGHT] and self.snake.orientation != "left":